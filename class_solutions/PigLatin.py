@@ -1,10 +1,17 @@
 import re
+from functools import lru_cache
 
 
 class PigLatin:
     """
     A class for translating words and sentences into Pig Latin.
     Pig Latin is a language game where words are altered according to specific rules.
+
+    The rules are compiled once per instance and translated words are memoized in an LRU cache, as
+    large texts repeat the same words over and over.
+
+    Attributes:
+        cache_size (int): Most words kept in the cache, None for no limit and 0 to disable it
     """
     VOWELS = "aeiouAEIOU"
 
@@ -15,9 +22,33 @@ class PigLatin:
         "sm", "sn", "sp", "st", "sw", "th", "tr", "tw",
         "wh", "wr"
     ]
+    CACHE_SIZE = 4096
+
+    WORD_START = re.compile(r"\w")
+    TOKENS = re.compile(r"\w+['’]?\w*|\W+")
+    FIRST_VOWEL = re.compile(r"[aeiou]")
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        # Alternatives are tried in order, so the longest blend that fits wins
+        blends = sorted(self.CONSONANT_BLENDS, key=len, reverse=True)
+        self._blend = re.compile("|".join(re.escape(blend) for blend in blends)) if blends else None
+        self._translate = lru_cache(maxsize=cache_size)(self._translate_word) if cache_size != 0 \
+            else self._translate_word
+
+    def cache_info(self):
+        """
+        Returns:
+            CacheInfo: Hits, misses, maximum and current size of the word cache, None if it is disabled
+        """
+        if self.cache_size == 0:
+            return None
+        return self._translate.cache_info()
 
-    def __init__(self):
-        pass
+    def cache_clear(self):
+        """Empty the word cache and reset its statistics."""
+        if self.cache_size != 0:
+            self._translate.cache_clear()
 
     def translate_word(self, word):
         """
@@ -43,7 +74,10 @@ class PigLatin:
             raise TypeError(f'Expected a string, got {type(word).__name__}')
         if not word:
             return word
+        return self._translate(word)
 
+    def _translate_word(self, word):
+        """Translate a non-empty word, see translate_word."""
         punctuation = word[-1] if not word[-1].isalnum() else ""
         core = word[:-1] if punctuation else word
 
@@ -56,12 +90,13 @@ class PigLatin:
         if core[0] in self.VOWELS:
             pig = core + "way"
         else:
-            prefix = next((b for b in sorted(self.CONSONANT_BLENDS, key=len, reverse=True) if core.startswith(b)), "")
+            blend = self._blend.match(core) if self._blend else None
+            prefix = blend.group() if blend else ""
 
             if prefix:
                 pig = core[len(prefix):] + prefix + "ay"
             else:
-                match = re.search(r"[aeiou]", core)
+                match = self.FIRST_VOWEL.search(core)
                 if match:
                     i = match.start()
                     pig = core[i:] + core[:i] + "ay"
@@ -91,10 +126,10 @@ class PigLatin:
         """
         if not isinstance(sentence, str):
             raise TypeError(f'Expected a string, got {type(sentence).__name__}')
-        tokens = re.findall(r"\w+['’]?\w*|\W+", sentence)
+        tokens = self.TOKENS.findall(sentence)
         try:
             translated = [
-                self.translate_word(token) if re.match(r"\w", token) else token
+                self.translate_word(token) if self.WORD_START.match(token) else token
                 for token in tokens
             ]
             return ''.join(translated)
@@ -0,0 +1,82 @@
+import os
+import random
+import time
+
+from classicalalgorithms_class import StreamingClosestPair, closest_pair_numpy, cKDTree, count_primes, np
+from numbers_class import EulerSeries
+
+
+def timed(func, *args):
+    """
+    Run func(*args) once and measure the wall-clock time.
+
+    Returns:
+        tuple: (result, elapsed seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_e(sizes=(10 ** 4, 10 ** 5, 10 ** 6)):
+    """
+    Time EulerSeries for each digit count, both from a cold engine and as an extension
+    of an engine that already holds half of the digits.
+
+    Args:
+        sizes (tuple): Digit counts to benchmark
+    """
+    for n in sizes:
+        _, cold = timed(EulerSeries().digits, n)
+        engine = EulerSeries()
+        engine.digits(n // 2)
+        _, warm = timed(engine.digits, n)
+        print(f"e to {n} digits: cold {cold:.3f}s, extended from {n // 2} digits {warm:.3f}s")
+
+
+def benchmark_parallel_sieve(hi=10 ** 9, workers=None):
+    """
+    Time count_primes below hi with 1, 2, 4, ... worker processes up to the CPU count
+    and report the speed-up over a single worker.
+
+    Args:
+        hi (int): Upper bound of the sieved range
+        workers (tuple, optional): Worker counts to benchmark
+    """
+    cpus = os.cpu_count() or 1
+    workers = workers or tuple(2 ** i for i in range(cpus.bit_length()) if 2 ** i <= cpus)
+    baseline = None
+    for count in workers:
+        primes, elapsed = timed(count_primes, hi, 0, count)
+        baseline = baseline or elapsed
+        print(f"pi({hi}) = {primes} with {count} workers: {elapsed:.3f}s, speed-up {baseline / elapsed:.2f}x")
+
+
+def benchmark_closest_pair(n=10 ** 5, dimensions=(2, 3, 8), stream_n=2 * 10 ** 4):
+    """
+    Time the closest pair of n uniform random points with the NumPy grid and KD-tree methods,
+    and of stream_n points inserted one by one into StreamingClosestPair, in each dimension.
+
+    Args:
+        n (int): Number of points for the NumPy methods
+        dimensions (tuple): Dimensions to benchmark
+        stream_n (int): Number of points for the streaming engine
+    """
+    for d in dimensions:
+        if np is not None:
+            points = np.random.default_rng(d).random((n, d))
+            for method in ("grid", "kdtree"):
+                if method == "kdtree" and cKDTree is None:
+                    continue
+                (_, _, distance), elapsed = timed(closest_pair_numpy, points, method)
+                print(f"{d}-D closest pair of {n} points ({method}): {distance:.3g} in {elapsed:.3f}s")
+        stream = [[random.random() for _ in range(d)] for _ in range(stream_n)]
+        engine, elapsed = timed(StreamingClosestPair, stream)
+        distance = engine.distance
+        print(f"{d}-D closest pair of {stream_n} streamed points: {distance:.3g} in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    benchmark_e()
+    benchmark_parallel_sieve()
+    benchmark_closest_pair()
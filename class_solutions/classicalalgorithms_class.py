@@ -1,5 +1,28 @@
+import heapq
+import json
 import random
 import math
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import compress
+from multiprocessing import shared_memory
+from operator import lt
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the vectorized paths fall back to plain Python
+    np = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy is optional, only the KD-tree closest pair needs it
+    cKDTree = None
 
 
 class CollatzConjecture:
@@ -34,20 +57,643 @@ class CollatzConjecture:
         """
         if self.n <= 1:
             raise ValueError('n must be greater than 1')
-        while self.n != 1:
-            if self.n % 2:
-                self.n = self.n * 3 + 1
+        n, steps = self.n, 0  # Walk a local copy so the calculation can be repeated
+        while n != 1:
+            if n % 2:
+                n = n * 3 + 1
             else:
-                self.n //= 2  # Changed to integer division
-            self.steps += 1
+                n //= 2
+            steps += 1
+        self.steps = steps
         return self.steps
 
 
+COLLATZ_CACHE_SIZE = 1 << 16  # Entries kept for values outside the memo array
+
+
+def collatz_steps_range(lo, hi, cache_size=COLLATZ_CACHE_SIZE):
+    """
+    Calculate the Collatz step counts of every starting value in [lo, hi) with a shared memo.
+    Step counts for [lo, hi) live in a compact 16-bit array (no starting value below 2^64 needs
+    more than 65535 steps), and values below 2 * hi outside it that trajectories pass through are
+    kept in a bounded cache that evicts its oldest entries. Every trajectory stops at the first
+    value whose count is already known, then the counts are filled in backwards along the path.
+
+    Args:
+        lo (int): First starting value (must be >= 1)
+        hi (int): End of the range (exclusive)
+        cache_size (int): Maximum number of entries in the cache for values outside [lo, hi)
+
+    Returns:
+        array: Unsigned 16-bit step counts, entry k belonging to lo + k
+
+    Raises:
+        ValueError: If the range is invalid
+    """
+    if lo < 1 or hi < lo:
+        raise ValueError('Invalid range')
+    memo = array('H', bytes(2 * (hi - lo)))  # 0 means not known yet, only 1 itself takes 0 steps
+    overflow = OrderedDict()
+    for n in range(lo, hi):
+        path = []
+        m = n
+        while m != 1:
+            if lo <= m < hi:
+                if memo[m - lo]:
+                    break
+            elif m in overflow:
+                break
+            path.append(m)
+            m = m * 3 + 1 if m & 1 else m >> 1
+        if m == 1:
+            steps = 0
+        else:
+            steps = memo[m - lo] if lo <= m < hi else overflow[m]
+        for value in reversed(path):
+            steps += 1
+            if lo <= value < hi:
+                memo[value - lo] = steps
+            elif cache_size > 0 and value < 2 * hi:  # Peaks far above the range are rarely revisited
+                if len(overflow) >= cache_size:
+                    overflow.popitem(last=False)
+                overflow[value] = steps
+    return memo
+
+
+_U64_ODD_LIMIT = (2 ** 64 - 2) // 3  # Largest odd value whose 3n + 1 still fits in 64 bits
+
+
+@lru_cache(maxsize=8)
+def _collatz_jump_tables(bits):
+    """
+    Build the k-step tables of the shortcut map T(n) = (3n + 1) / 2 or n / 2 for k = bits.
+    For n = a * 2^k + b, k applications of T give a * 3^c[b] + d[b], which is k + c[b] steps
+    of the standard map.
+
+    Returns:
+        tuple: (3^c, d, standard steps) as NumPy arrays indexed by the residue b
+    """
+    size = 1 << bits
+    pow3 = np.empty(size, dtype=np.uint64)
+    offset = np.empty(size, dtype=np.uint64)
+    steps = np.empty(size, dtype=np.int64)
+    for b in range(size):
+        value, odd = b, 0
+        for _ in range(bits):
+            if value & 1:
+                value = (3 * value + 1) // 2
+                odd += 1
+            else:
+                value //= 2
+        pow3[b], offset[b], steps[b] = 3 ** odd, value, bits + odd
+    return pow3, offset, steps
+
+
+def _collatz_finish(value, steps, peak, stop, start):
+    """Finish one trajectory with Python ints once it no longer fits in 64 bits."""
+    while value != 1:
+        if value & 1:
+            value = 3 * value + 1
+            peak = max(peak, value)
+        else:
+            value //= 2
+        steps += 1
+        if stop < 0 and value < start:
+            stop = steps
+    return steps, peak, stop
+
+
+def collatz_metrics(starts, table_bits=8):
+    """
+    Calculate Collatz metrics for a whole array of starting values, advancing all of them in
+    lockstep with NumPy and dropping lanes as they reach 1. Odd values take the (3n + 1) / 2
+    shortcut (two steps at once). Once a lane has passed its stopping time and is far enough
+    below its peak that the next table_bits shortcut steps cannot exceed it, it jumps that many
+    steps at once through a lookup table. Lanes whose next 3n + 1 would overflow 64 bits are
+    finished with Python ints.
+
+    Args:
+        starts (array-like): Starting values (each >= 1 and below 2^64)
+        table_bits (int): Shortcut steps per table jump, 0 to disable jumps
+
+    Returns:
+        tuple: (steps, max_excursion, stopping_time) arrays in the order of starts, where steps is
+            the number of steps to reach 1, max_excursion the largest value reached and
+            stopping_time the number of steps until the value first drops below its start
+            (0 for 1); max_excursion has object dtype if any lane exceeded 64 bits
+
+    Raises:
+        ImportError: If NumPy is not installed
+        ValueError: If a starting value is smaller than 1
+    """
+    if np is None:
+        raise ImportError('collatz_metrics requires NumPy')
+    start = np.asarray(starts, dtype=np.uint64).ravel()
+    if start.size and start.min() < 1:
+        raise ValueError('Starting values must be at least 1')
+    steps = np.zeros(start.size, dtype=np.int64)
+    peak = start.copy()
+    stop = np.where(start == 1, 0, -1)
+    if table_bits:
+        pow3, offset, jump_steps = _collatz_jump_tables(table_bits)
+        # T^j(n) + 1 <= 1.5^j * (n + 1), and the standard map peaks at 2 * T(n)
+        headroom = math.ceil(2 * 1.5 ** table_bits) + 1
+        residue_mask = (1 << table_bits) - 1
+    big_lanes = []
+
+    # Per-lane state of the unfinished lanes, compacted whenever enough of them have reached 1
+    lanes = np.flatnonzero(start != 1)
+    lane_start = start[lanes]
+    v = lane_start.copy()
+    lane_steps = np.zeros(lanes.size, dtype=np.int64)
+    lane_peak = lane_start.copy()
+    lane_stop = np.full(lanes.size, -1, dtype=np.int64)
+    while lanes.size:
+        live = v != 1
+        odd = (v & 1).astype(bool)
+        overflow = odd & (v > _U64_ODD_LIMIT)
+        if overflow.any():
+            big_lanes.extend(zip(lanes[overflow].tolist(), v[overflow].tolist(), lane_steps[overflow].tolist(),
+                                 lane_peak[overflow].tolist(), lane_stop[overflow].tolist()))
+            live &= ~overflow
+        finished = ~live
+        if overflow.any() or finished.sum() * 8 >= lanes.size:
+            done = finished & ~overflow
+            steps[lanes[done]], peak[lanes[done]], stop[lanes[done]] = \
+                lane_steps[done], lane_peak[done], lane_stop[done]
+            lanes, lane_start, v = lanes[live], lane_start[live], v[live]
+            lane_steps, lane_peak, lane_stop = lane_steps[live], lane_peak[live], lane_stop[live]
+            odd, live = odd[live], live[live]
+
+        up = v * 3 + 1
+        np.maximum(lane_peak, up, out=lane_peak, where=odd & live)
+        following = np.where(odd, up >> 1, v >> 1)
+        taken = odd.astype(np.int64) + 1
+        if table_bits:
+            jump = (lane_stop >= 0) & (v >> table_bits > 0) & (v < lane_peak // headroom)
+            if jump.any():
+                residue = v & residue_mask
+                following = np.where(jump, (v >> table_bits) * pow3[residue] + offset[residue], following)
+                taken = np.where(jump, jump_steps[residue], taken)
+        v = np.where(live, following, v)
+        lane_steps += taken * live
+        # A shortcut step on an odd value always ends above the value, so only halvings can drop below the start
+        lane_stop = np.where((lane_stop < 0) & (v < lane_start), lane_steps, lane_stop)
+
+    if big_lanes:
+        peak = peak.astype(object)
+        for lane, value, lane_steps, lane_peak, lane_stop in big_lanes:
+            steps[lane], peak[lane], stop[lane] = _collatz_finish(
+                value, lane_steps, lane_peak, lane_stop, int(start[lane]))
+    return steps, peak, stop
+
+
+COLLATZ_SMALL_TABLE = 1 << 20  # Starting values whose step counts each search process keeps in memory
+_collatz_small_steps = None
+
+
+@lru_cache(maxsize=8)
+def _collatz_merge_sieve(bits):
+    """
+    Find the residues mod 2^bits whose trajectories merge with a smaller residue's.
+    After k = bits shortcut steps, n = a * 2^k + b becomes a * 3^c + T^k(b); when a smaller b'
+    gives the same (c, T^k(b')), then n and n - (b - b') meet after the same number of steps
+    and have equal step counts, so the larger one can never be the first to reach a maximum.
+
+    Returns:
+        list: For every residue b, the smaller residue it merges with, or -1 if there is none
+    """
+    first_residue = {}
+    partner = []
+    for b in range(1 << bits):
+        value, odd = b, 0
+        for _ in range(bits):
+            if value & 1:
+                value = (3 * value + 1) // 2
+                odd += 1
+            else:
+                value //= 2
+        key = (odd, value)
+        partner.append(first_residue.get(key, -1))
+        first_residue.setdefault(key, b)
+    return partner
+
+
+def _collatz_steps_fast(n):
+    """Count Collatz steps with the shortcut map until n falls into the per-process table."""
+    global _collatz_small_steps
+    if _collatz_small_steps is None:
+        _collatz_small_steps = collatz_steps_range(1, COLLATZ_SMALL_TABLE + 1)
+    steps = 0
+    while n > COLLATZ_SMALL_TABLE:
+        if n & 1:
+            n = (3 * n + 1) >> 1
+            steps += 2
+        else:
+            n >>= 1
+            steps += 1
+    return steps + _collatz_small_steps[n - 1]
+
+
+def _collatz_search_shard(lo, hi, range_lo, bits):
+    """
+    Find the starting value in [lo, hi) with the most steps (the smallest one on ties), skipping
+    values whose merge partner from _collatz_merge_sieve also lies in the searched range.
+
+    Returns:
+        tuple: (starting value, steps), or (None, -1) if the shard was empty
+    """
+    partner = _collatz_merge_sieve(bits)
+    mask = (1 << bits) - 1
+    best_n, best_steps = None, -1
+    for n in range(lo, hi):
+        if n >> bits:  # Values below 2^bits could reach 1 within the sieved steps
+            p = partner[n & mask]
+            if p >= 0 and n - ((n & mask) - p) >= range_lo:
+                continue
+        steps = _collatz_steps_fast(n)
+        if steps > best_steps:
+            best_n, best_steps = n, steps
+    return best_n, best_steps
+
+
+class CollatzRecordSearch:
+    """
+    Searches a range of starting values for the one with the longest Collatz trajectory.
+    The range is cut into shards that run on a process pool; each shard skips starting values
+    that provably tie with a smaller one (residue classes mod 2^bits that merge after bits
+    shortcut steps) and reports its maximum, and the maxima are merged in the parent. Finished
+    shards are saved to a JSON checkpoint, so an interrupted search resumes where it stopped.
+    """
+
+    def __init__(self, lo, hi, shard_size=10 ** 6, workers=None, checkpoint=None, sieve_bits=10):
+        """
+        Initialize the search.
+
+        Args:
+            lo (int): First starting value (must be >= 1)
+            hi (int): End of the range (exclusive)
+            shard_size (int): Starting values per worker task
+            workers (int, optional): Number of processes, defaults to the CPU count
+            checkpoint (str, optional): Path of the JSON file recording finished shards
+            sieve_bits (int): Residue classes mod 2^sieve_bits are used for pruning
+
+        Raises:
+            ValueError: If the range or the shard size is invalid
+        """
+        if lo < 1 or hi <= lo:
+            raise ValueError('Invalid range')
+        if shard_size < 1:
+            raise ValueError('Shard size must be positive')
+        self.lo = lo
+        self.hi = hi
+        self.shard_size = shard_size
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint = checkpoint
+        self.sieve_bits = sieve_bits
+        self.results = {}  # Shard index -> (starting value, steps)
+
+    def _parameters(self):
+        return {'lo': self.lo, 'hi': self.hi, 'shard_size': self.shard_size, 'sieve_bits': self.sieve_bits}
+
+    def _load_checkpoint(self):
+        """Load the finished shards of an earlier run of the same search."""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+        if state['parameters'] != self._parameters():
+            raise ValueError('Checkpoint belongs to a different search')
+        self.results = {int(shard): tuple(result) for shard, result in state['results'].items()}
+
+    def _save_checkpoint(self):
+        """Write the finished shards atomically, so a crash never leaves a torn checkpoint."""
+        if not self.checkpoint:
+            return
+        state = {'parameters': self._parameters(), 'results': self.results}
+        temporary = self.checkpoint + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, self.checkpoint)
+
+    def run(self):
+        """
+        Run (or resume) the search.
+
+        Returns:
+            tuple: (starting value, steps) of the longest trajectory, the smallest value on ties
+        """
+        self._load_checkpoint()
+        shards = (self.hi - self.lo + self.shard_size - 1) // self.shard_size
+        pending = iter([shard for shard in range(shards) if shard not in self.results])
+        with ProcessPoolExecutor(self.workers) as pool:
+            running = {}
+            while True:
+                # Keep two tasks per worker in flight instead of queueing every shard up front
+                for shard in pending:
+                    first = self.lo + shard * self.shard_size
+                    last = min(self.hi, first + self.shard_size)
+                    running[pool.submit(_collatz_search_shard, first, last, self.lo, self.sieve_bits)] = shard
+                    if len(running) >= 2 * self.workers:
+                        break
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self.results[running.pop(future)] = future.result()
+                self._save_checkpoint()
+        best_n, best_steps = min((result for result in self.results.values() if result[0] is not None),
+                                 key=lambda result: (-result[1], result[0]))
+        return best_n, best_steps
+
+
+MIN_GALLOP = 7  # Consecutive wins of one run before a merge switches to galloping
+
+
+class _AdaptiveMerge:
+    """
+    State of one adaptive (Timsort-style) merge sort: natural runs are detected, short ones are
+    extended to a minimum length with binary insertion sort, and runs are merged from a stack
+    whose lengths are kept balanced, galloping through long stretches taken from the same run.
+    Keys and values live in parallel lists, so records are moved without wrapping them in tuples;
+    when there is no key function both names refer to the same list.
+    """
+
+    def __init__(self, values, key, reverse):
+        self.values = list(values)
+        self.keys = list(map(key, self.values)) if key is not None else self.values
+        self.paired = key is not None
+        self.lt = (lambda a, b: b < a) if reverse else lt  # Reversing the comparison keeps equal items stable
+        self.min_gallop = MIN_GALLOP
+        self.runs = []  # Stack of [start, length]
+
+    @staticmethod
+    def min_run(n):
+        """Run length in [32, 64] such that n / min_run is close to, but not above, a power of two."""
+        extra = 0
+        while n >= 64:
+            extra |= n & 1
+            n >>= 1
+        return n + extra
+
+    def sort(self):
+        """Sort the values and return them."""
+        n = len(self.values)
+        min_run = self.min_run(n)
+        lo = 0
+        while lo < n:
+            length = self.count_run(lo, n)
+            if length < min_run:
+                forced = min(min_run, n - lo)
+                self.binary_insertion_sort(lo, lo + forced, lo + length)
+                length = forced
+            self.runs.append([lo, length])
+            self.merge_collapse()
+            lo += length
+        while len(self.runs) > 1:
+            i = len(self.runs) - 2
+            if i > 0 and self.runs[i - 1][1] < self.runs[i + 1][1]:
+                i -= 1
+            self.merge_at(i)
+        return self.values
+
+    def count_run(self, lo, hi):
+        """Return the length of the run starting at lo, reversing it in place if it is strictly descending."""
+        keys, lt_ = self.keys, self.lt
+        end = lo + 1
+        if end == hi:
+            return 1
+        if lt_(keys[end], keys[lo]):
+            while end + 1 < hi and lt_(keys[end + 1], keys[end]):
+                end += 1
+            keys[lo:end + 1] = keys[lo:end + 1][::-1]
+            if self.paired:
+                self.values[lo:end + 1] = self.values[lo:end + 1][::-1]
+        else:
+            while end + 1 < hi and not lt_(keys[end + 1], keys[end]):
+                end += 1
+        return end + 1 - lo
+
+    def binary_insertion_sort(self, lo, hi, start):
+        """Extend the sorted run lo..start to lo..hi, inserting each item after its equals."""
+        keys, values, lt_ = self.keys, self.values, self.lt
+        for i in range(start, hi):
+            pivot = keys[i]
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                if lt_(pivot, keys[mid]):
+                    right = mid
+                else:
+                    left = mid + 1
+            if left < i:
+                keys[left + 1:i + 1] = keys[left:i]
+                keys[left] = pivot
+                if self.paired:
+                    item = values[i]
+                    values[left + 1:i + 1] = values[left:i]
+                    values[left] = item
+
+    def merge_collapse(self):
+        """Merge the top runs until their lengths shrink geometrically towards the top of the stack."""
+        runs = self.runs
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+                self.merge_at(i)
+            elif runs[i][1] <= runs[i + 1][1]:
+                self.merge_at(i)
+            else:
+                break
+
+    @staticmethod
+    def gallop(pred, keys, lo, hi, from_right=False):
+        """
+        Find the first index p in [lo, hi] where pred(keys[p]) holds (pred goes from false to true),
+        probing 1, 2, 4, ... positions away from lo (or hi) before a binary search.
+        """
+        if from_right:
+            upper, offset, probe = hi, 1, hi - 1
+            while probe >= lo and pred(keys[probe]):
+                upper = probe
+                offset *= 2
+                probe = hi - offset
+            lower = max(probe + 1, lo)
+        else:
+            lower, offset, probe = lo, 1, lo
+            while probe < hi and not pred(keys[probe]):
+                lower = probe + 1
+                offset *= 2
+                probe = lo + offset - 1
+            upper = min(probe, hi)
+        while lower < upper:
+            mid = (lower + upper) // 2
+            if pred(keys[mid]):
+                upper = mid
+            else:
+                lower = mid + 1
+        return lower
+
+    def merge_at(self, i):
+        """Merge runs i and i + 1 of the stack."""
+        keys, lt_ = self.keys, self.lt
+        start_a, length_a = self.runs[i]
+        start_b, length_b = self.runs[i + 1]
+        self.runs[i][1] = length_a + length_b
+        del self.runs[i + 1]
+
+        # Items of A not greater than B's first item, and items of B not less than A's last, are in place
+        first_b, last_a = keys[start_b], keys[start_b - 1]
+        skip = self.gallop(lambda key: lt_(first_b, key), keys, start_a, start_b) - start_a
+        start_a, length_a = start_a + skip, length_a - skip
+        if length_a == 0:
+            return
+        length_b = self.gallop(lambda key: not lt_(key, last_a), keys, start_b, start_b + length_b,
+                               from_right=True) - start_b
+        if length_b == 0:
+            return
+        if length_a <= length_b:
+            self.merge_lo(start_a, length_a, start_b, length_b)
+        else:
+            self.merge_hi(start_a, length_a, start_b, length_b)
+
+    def merge_lo(self, start_a, length_a, start_b, length_b):
+        """Merge with a temporary copy of the (shorter) left run, filling the output from the left."""
+        keys, values, lt_, paired = self.keys, self.values, self.lt, self.paired
+        temp_keys = keys[start_a:start_b]
+        temp_values = values[start_a:start_b] if paired else temp_keys
+        i, j, dest = 0, start_b, start_a
+        end_b = start_b + length_b
+        while i < length_a and j < end_b:
+            wins_a = wins_b = 0
+            while i < length_a and j < end_b:  # One item at a time
+                if lt_(keys[j], temp_keys[i]):
+                    keys[dest] = keys[j]
+                    if paired:
+                        values[dest] = values[j]
+                    j += 1
+                    wins_a, wins_b = 0, wins_b + 1
+                else:
+                    keys[dest] = temp_keys[i]
+                    if paired:
+                        values[dest] = temp_values[i]
+                    i += 1
+                    wins_a, wins_b = wins_a + 1, 0
+                dest += 1
+                if wins_a >= self.min_gallop or wins_b >= self.min_gallop:
+                    break
+            while i < length_a and j < end_b:  # Galloping: copy whole stretches of one run
+                key_b = keys[j]
+                count_a = self.gallop(lambda key: lt_(key_b, key), temp_keys, i, length_a) - i
+                keys[dest:dest + count_a] = temp_keys[i:i + count_a]
+                if paired:
+                    values[dest:dest + count_a] = temp_values[i:i + count_a]
+                dest, i = dest + count_a, i + count_a
+                if i == length_a:
+                    break
+                key_a = temp_keys[i]
+                count_b = self.gallop(lambda key: not lt_(key, key_a), keys, j, end_b) - j
+                keys[dest:dest + count_b] = keys[j:j + count_b]
+                if paired:
+                    values[dest:dest + count_b] = values[j:j + count_b]
+                dest, j = dest + count_b, j + count_b
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    self.min_gallop += 1  # Galloping does not pay off here, make it harder to re-enter
+                    break
+                self.min_gallop = max(1, self.min_gallop - 1)
+        # Whatever is left of B is already in place
+        keys[dest:dest + length_a - i] = temp_keys[i:]
+        if paired:
+            values[dest:dest + length_a - i] = temp_values[i:]
+
+    def merge_hi(self, start_a, length_a, start_b, length_b):
+        """Merge with a temporary copy of the (shorter) right run, filling the output from the right."""
+        keys, values, lt_, paired = self.keys, self.values, self.lt, self.paired
+        temp_keys = keys[start_b:start_b + length_b]
+        temp_values = values[start_b:start_b + length_b] if paired else temp_keys
+        i, j, dest = length_b - 1, start_b - 1, start_b + length_b - 1
+        while i >= 0 and j >= start_a:
+            wins_a = wins_b = 0
+            while i >= 0 and j >= start_a:  # One item at a time
+                if lt_(temp_keys[i], keys[j]):
+                    keys[dest] = keys[j]
+                    if paired:
+                        values[dest] = values[j]
+                    j -= 1
+                    wins_a, wins_b = wins_a + 1, 0
+                else:
+                    keys[dest] = temp_keys[i]
+                    if paired:
+                        values[dest] = temp_values[i]
+                    i -= 1
+                    wins_a, wins_b = 0, wins_b + 1
+                dest -= 1
+                if wins_a >= self.min_gallop or wins_b >= self.min_gallop:
+                    break
+            while i >= 0 and j >= start_a:  # Galloping from the right end
+                key_b = temp_keys[i]
+                first = self.gallop(lambda key: lt_(key_b, key), keys, start_a, j + 1, from_right=True)
+                count_a = j + 1 - first
+                keys[dest - count_a + 1:dest + 1] = keys[first:j + 1]
+                if paired:
+                    values[dest - count_a + 1:dest + 1] = values[first:j + 1]
+                dest, j = dest - count_a, j - count_a
+                if j < start_a:
+                    break
+                key_a = keys[j]
+                first = self.gallop(lambda key: not lt_(key, key_a), temp_keys, 0, i + 1, from_right=True)
+                count_b = i + 1 - first
+                keys[dest - count_b + 1:dest + 1] = temp_keys[first:i + 1]
+                if paired:
+                    values[dest - count_b + 1:dest + 1] = temp_values[first:i + 1]
+                dest, i = dest - count_b, i - count_b
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    self.min_gallop += 1
+                    break
+                self.min_gallop = max(1, self.min_gallop - 1)
+        # Whatever is left of A is already in place
+        keys[start_a:start_a + i + 1] = temp_keys[:i + 1]
+        if paired:
+            values[start_a:start_a + i + 1] = temp_values[:i + 1]
+
+
+PARALLEL_SORT_THRESHOLD = 1 << 16  # Below this many elements process start-up costs more than it saves
+
+
+def _shared_typecode(lst):
+    """Return the array typecode ('q' or 'd') that holds every element of lst exactly, or None."""
+    if all(type(x) is int for x in lst):
+        return 'q' if -2 ** 63 <= min(lst) and max(lst) < 2 ** 63 else None
+    if all(type(x) is float for x in lst):
+        return 'd'
+    return None
+
+
+def _sort_chunk(chunk):
+    """Sort one pickled chunk in a pool process."""
+    return MergeSorter(chunk).bottom_up_sort()
+
+
+def _sort_shared_chunk(name, typecode, lo, hi):
+    """Sort items lo..hi of a shared memory array in place in a pool process."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        view[lo:hi] = array(typecode, MergeSorter(view[lo:hi].tolist()).bottom_up_sort())
+    finally:
+        view.release()
+        shm.close()
+
+
 class MergeSorter:
     """
     Implements the Merge Sort algorithm, a divide-and-conquer sorting algorithm
     with O(n log n) time complexity.
     """
+    INSERTION_RUN = 32  # Run length sorted by insertion before the bottom-up merge passes
 
     def __init__(self, lst):
         """
@@ -58,9 +704,164 @@ class MergeSorter:
         """
         self.lst = lst
 
-    def sort(self):
-        """Return a new sorted list using merge sort algorithm."""
-        return self.merge_sort(self.lst)
+    def sort(self, mode='top_down', key=None, reverse=False):
+        """
+        Return a new sorted list using merge sort algorithm.
+
+        Args:
+            mode (str): 'top_down' for the recursive merge sort, 'bottom_up' for the iterative one,
+                'adaptive' for the natural-run merge sort, 'parallel' for the multiprocess one
+            key (callable, optional): Key function, only supported by the adaptive mode
+            reverse (bool): Sort in descending order, only supported by the adaptive mode
+
+        Returns:
+            list: Sorted list
+
+        Raises:
+            ValueError: If the mode is unknown or does not support key/reverse
+        """
+        if mode == 'adaptive':
+            return self.adaptive_sort(key, reverse)
+        if key is not None or reverse:
+            raise ValueError(f'Sort mode {mode} does not support key or reverse')
+        if mode == 'top_down':
+            return self.merge_sort(self.lst)
+        if mode == 'bottom_up':
+            return self.bottom_up_sort()
+        if mode == 'parallel':
+            return self.parallel_sort()
+        raise ValueError(f'Unknown sort mode: {mode}')
+
+    def adaptive_sort(self, key=None, reverse=False):
+        """
+        Sort with natural-run detection in the style of Timsort: ascending and strictly descending
+        runs already present in the data are kept, short runs are extended by binary insertion and
+        merges gallop through long one-sided stretches, so sorted or nearly sorted input takes
+        close to linear time. The sort is stable, also with reverse=True.
+
+        Args:
+            key (callable, optional): Function computing the comparison key of each element once
+            reverse (bool): Sort in descending order
+
+        Returns:
+            list: Sorted list
+        """
+        return _AdaptiveMerge(self.lst, key, reverse).sort()
+
+    def parallel_sort(self, workers=None, threshold=PARALLEL_SORT_THRESHOLD):
+        """
+        Sort one chunk per worker on a process pool and k-way merge the sorted chunks with a heap.
+        Lists of ints that fit in 64 bits or of floats are copied once into shared memory and sorted
+        there in place, so no chunks are pickled; other lists are pickled to the workers. Lists shorter
+        than threshold, or a single worker, are sorted in-process with bottom_up_sort.
+
+        Args:
+            workers (int, optional): Number of processes, defaults to the CPU count
+            threshold (int): Minimum list length worth sorting on a process pool
+
+        Returns:
+            list: Sorted list
+        """
+        workers = workers or os.cpu_count() or 1
+        n = len(self.lst)
+        if workers == 1 or n < max(threshold, 2):
+            return self.bottom_up_sort()
+        bounds = [n * i // workers for i in range(workers + 1)]
+        typecode = _shared_typecode(self.lst)
+        with ProcessPoolExecutor(workers) as pool:
+            if typecode is None:
+                chunks = list(pool.map(_sort_chunk, [self.lst[lo:hi] for lo, hi in zip(bounds, bounds[1:])]))
+                return list(heapq.merge(*chunks))
+
+            data = array(typecode, self.lst)
+            shm = shared_memory.SharedMemory(create=True, size=len(data) * data.itemsize)
+            try:
+                shm.buf[:len(data) * data.itemsize] = data.tobytes()
+                futures = [pool.submit(_sort_shared_chunk, shm.name, typecode, lo, hi)
+                           for lo, hi in zip(bounds, bounds[1:])]
+                for future in futures:
+                    future.result()
+                view = shm.buf.cast(typecode)
+                chunks = [view[lo:hi].tolist() for lo, hi in zip(bounds, bounds[1:])]
+                view.release()
+            finally:
+                shm.close()
+                shm.unlink()
+        return list(heapq.merge(*chunks))
+
+    def bottom_up_sort(self):
+        """
+        Sort iteratively without recursion or per-level sublists. Runs of INSERTION_RUN elements
+        are insertion-sorted first, then runs of doubling width are merged while ping-ponging between
+        a copy of the list and a single auxiliary buffer of the same size. Two runs that are already
+        in order are copied instead of merged.
+
+        Returns:
+            list: Sorted list
+        """
+        src = list(self.lst)
+        n = len(src)
+        for lo in range(0, n, self.INSERTION_RUN):
+            self.insertion_sort(src, lo, min(lo + self.INSERTION_RUN, n))
+
+        dst = [None] * n
+        width = self.INSERTION_RUN
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                if mid == hi or src[mid - 1] <= src[mid]:  # Nothing to merge or already in order
+                    dst[lo:hi] = src[lo:hi]
+                else:
+                    self.merge_into(src, dst, lo, mid, hi)
+            src, dst = dst, src
+            width *= 2
+        return src
+
+    @staticmethod
+    def insertion_sort(lst, lo, hi):
+        """
+        Stable in-place insertion sort of lst[lo:hi].
+
+        Args:
+            lst (list): List holding the run
+            lo (int): Start of the run
+            hi (int): End of the run (exclusive)
+        """
+        for i in range(lo + 1, hi):
+            item = lst[i]
+            j = i - 1
+            while j >= lo and item < lst[j]:
+                lst[j + 1] = lst[j]
+                j -= 1
+            lst[j + 1] = item
+
+    @staticmethod
+    def merge_into(src, dst, lo, mid, hi):
+        """
+        Merge the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi].
+        Equal elements are taken from the left run first, which keeps the sort stable.
+
+        Args:
+            src (list): List holding both runs
+            dst (list): List receiving the merged run at the same position
+            lo (int): Start of the left run
+            mid (int): Start of the right run
+            hi (int): End of the right run (exclusive)
+        """
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+        if i < mid:
+            dst[k:hi] = src[i:mid]
+        else:
+            dst[k:hi] = src[j:hi]
 
     def merge_sort(self, lst):
         """
@@ -105,11 +906,186 @@ class MergeSorter:
         return merged
 
 
+class ExternalMergeSorter:
+    """
+    Sorts files that do not fit in memory. The input is read in chunks that fit the memory budget,
+    each chunk is sorted with MergeSorter and written to a temporary run file, and the runs are
+    merged k-way with buffered reads, at most fan_in runs at a time, into the output file.
+
+    Records are either newline-delimited text lines, compared as bytes, or fixed-width binary
+    records described by a struct format and compared by their unpacked fields.
+
+    Attributes:
+        memory_limit (int): Approximate number of bytes of records held in memory at once
+        fan_in (int): Maximum number of runs merged in one pass
+        record (struct.Struct): Binary record layout, None for text lines
+        temp_dir (str): Directory of the run files, None for the system default
+    """
+
+    def __init__(self, memory_limit=64 << 20, fan_in=64, record_format=None, temp_dir=None):
+        """
+        Initialize the external sorter.
+
+        Args:
+            memory_limit (int): Memory budget in bytes
+            fan_in (int): Maximum number of runs merged at once (must be >= 2)
+            record_format (str, optional): struct format of a binary record, e.g. '<q' or '<qd';
+                text lines are sorted if omitted
+            temp_dir (str, optional): Directory for the temporary run files
+
+        Raises:
+            ValueError: If the budget or the fan-in is too small
+        """
+        if memory_limit < 1:
+            raise ValueError('Memory limit must be positive')
+        if fan_in < 2:
+            raise ValueError('Fan-in must be at least 2')
+        self.memory_limit = memory_limit
+        self.fan_in = fan_in
+        self.record = struct.Struct(record_format) if record_format is not None else None
+        self.temp_dir = temp_dir
+
+    def sort(self, input_path, output_path):
+        """
+        Sort the records of input_path into output_path.
+
+        Args:
+            input_path (str): File to sort
+            output_path (str): File receiving the sorted records, may be the input file
+
+        Raises:
+            ValueError: If a binary input is not a whole number of records
+        """
+        runs = []
+        try:
+            with open(input_path, 'rb') as f:
+                for chunk in self.read_chunks(f):
+                    runs.append(self.write_run(MergeSorter(chunk).sort('adaptive')))
+            while len(runs) > self.fan_in:
+                runs = [self.merge_runs(runs[i:i + self.fan_in]) for i in range(0, len(runs), self.fan_in)]
+            with open(output_path, 'wb') as out:
+                self.merge_runs(runs, out)
+        finally:
+            for path in runs:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def read_chunks(self, f):
+        """
+        Read the input in chunks of records that fit the memory budget.
+
+        Yields:
+            list: Text lines (bytes, each ending with a newline) or unpacked record tuples
+        """
+        if self.record is None:
+            chunk, used = [], 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    line += b'\n'
+                chunk.append(line)
+                used += sys.getsizeof(line) + 8
+                if used >= self.memory_limit:
+                    yield chunk
+                    chunk, used = [], 0
+            if chunk:
+                yield chunk
+            return
+
+        size = self.record.size
+        sample = self.record.unpack(bytes(size))
+        per_record = sys.getsizeof(sample) + sum(sys.getsizeof(field) for field in sample) + 8
+        chunk_bytes = max(1, self.memory_limit // per_record) * size
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                return
+            if len(data) % size:
+                raise ValueError('Input size is not a multiple of the record size')
+            yield list(self.record.iter_unpack(data))
+
+    def buffer_size(self, streams):
+        """Bytes of read or write buffer per open run so that all buffers share the memory budget."""
+        size = self.memory_limit // (streams + 1)
+        if self.record is not None:
+            size -= size % self.record.size
+        return max(size, self.record.size if self.record is not None else 1, 4096)
+
+    def iter_run(self, f, buffer_size):
+        """Iterate over the records of a run file, reading buffer_size bytes at a time."""
+        if self.record is None:
+            yield from f
+            return
+        while True:
+            data = f.read(buffer_size)
+            if not data:
+                return
+            yield from self.record.iter_unpack(data)
+
+    def write_records(self, out, records):
+        """Write records to an open binary file."""
+        if self.record is None:
+            out.writelines(records)
+        else:
+            pack = self.record.pack
+            out.writelines(pack(*fields) for fields in records)
+
+    def write_run(self, records):
+        """
+        Write sorted records to a new temporary run file.
+
+        Returns:
+            str: Path of the run file
+        """
+        fd, path = tempfile.mkstemp(suffix='.run', dir=self.temp_dir)
+        with os.fdopen(fd, 'wb', buffering=self.buffer_size(1)) as out:
+            self.write_records(out, records)
+        return path
+
+    def merge_runs(self, runs, out=None):
+        """
+        Merge sorted run files with a heap, into out if given or into a new run file.
+        Equal records keep the order of the runs, so the external sort is stable.
+
+        Args:
+            runs (list): Paths of the run files, they are removed after merging
+            out (file, optional): Open binary file receiving the merged records
+
+        Returns:
+            str: Path of the new run file, or None when writing to out
+        """
+        buffer_size = self.buffer_size(len(runs))
+        files = [open(path, 'rb', buffering=buffer_size) for path in runs]
+        try:
+            merged = heapq.merge(*(self.iter_run(f, buffer_size) for f in files))
+            if out is not None:
+                self.write_records(out, merged)
+                path = None
+            else:
+                path = self.write_run(merged)
+        finally:
+            for f in files:
+                f.close()
+        for run in runs:
+            os.remove(run)
+        return path
+
+
 class BubbleSorter:
     """
     Implements the Bubble Sort algorithm, a simple sorting algorithm
     with O(n²) time complexity in worst case.
+
+    Besides plain bubble passes it offers cocktail (bidirectional) passes and comb sort. Longer
+    lists are handed to insertion sort or, above MERGE_THRESHOLD, to the merge sorter.
+
+    Attributes:
+        comparisons (int): Element comparisons made by the last sort
+        swaps (int): Swaps (element shifts for insertion sort) made by the last sort
+        engine (str): Algorithm that performed the last sort
     """
+    INSERTION_THRESHOLD = 64  # Longer lists are insertion-sorted, which does far fewer comparisons
+    MERGE_THRESHOLD = 1024  # Longer lists are merge-sorted
+    COMB_SHRINK = 1.3  # Gap shrink factor of comb sort
 
     def __init__(self, lst):
         """
@@ -120,24 +1096,522 @@ class BubbleSorter:
         """
         self.lst = lst
         self.n = len(lst)
+        self.comparisons = 0
+        self.swaps = 0
+        self.engine = None
 
-    def sort(self):
+    def sort(self, mode='bubble', delegate=True):
         """
-        Sort the list in-place using bubble sort with early termination.
-        
+        Sort the list in-place.
+
+        Args:
+            mode (str): 'bubble', 'cocktail' or 'comb'; comb sort is not stable
+            delegate (bool): Use insertion sort or the merge sorter for lists past the thresholds
+
         Returns:
             list: The sorted list
+
+        Raises:
+            ValueError: If the mode is unknown
         """
-        for i in range(self.n):
-            swapped_flag = False
-            for j in range(self.n - i - 1):
-                if self.lst[j] > self.lst[j + 1]:
-                    self.lst[j], self.lst[j + 1] = self.lst[j + 1], self.lst[j]
-                    swapped_flag = True
-            if not swapped_flag:  # Early termination if no swaps occurred
-                break
+        if mode not in ('bubble', 'cocktail', 'comb'):
+            raise ValueError(f'Unknown sort mode: {mode}')
+        self.comparisons = self.swaps = 0
+        if delegate and self.n > self.MERGE_THRESHOLD:
+            self.engine = 'merge'
+            self.lst[:] = MergeSorter(self.lst).bottom_up_sort()
+        elif delegate and self.n > self.INSERTION_THRESHOLD:
+            self.engine = 'insertion'
+            self.insertion_sort()
+        else:
+            self.engine = mode
+            getattr(self, f'{mode}_sort')()
         return self.lst
 
+    def bubble_sort(self):
+        """
+        Bubble passes with early termination. Everything after the last swap of a pass is in its
+        final place, so the next pass stops there instead of at n - i - 1.
+        """
+        lst = self.lst
+        comparisons = swaps = 0
+        bound = self.n - 1
+        while bound > 0:
+            last_swap = 0
+            for j in range(bound):
+                if lst[j] > lst[j + 1]:
+                    lst[j], lst[j + 1] = lst[j + 1], lst[j]
+                    swaps += 1
+                    last_swap = j
+            comparisons += bound
+            bound = last_swap  # No swaps means the list is sorted
+        self.comparisons += comparisons
+        self.swaps += swaps
+
+    def cocktail_sort(self):
+        """
+        Alternate forward and backward passes, each shrinking the unsorted window to its last swap,
+        so small elements near the end need one backward pass instead of one pass per position.
+        """
+        lst = self.lst
+        comparisons = swaps = 0
+        lo, hi = 0, self.n - 1
+        while lo < hi:
+            last_swap = lo
+            for j in range(lo, hi):
+                if lst[j] > lst[j + 1]:
+                    lst[j], lst[j + 1] = lst[j + 1], lst[j]
+                    swaps += 1
+                    last_swap = j
+            comparisons += hi - lo
+            hi = last_swap
+            if lo >= hi:
+                break
+            last_swap = hi
+            for j in range(hi - 1, lo - 1, -1):
+                if lst[j] > lst[j + 1]:
+                    lst[j], lst[j + 1] = lst[j + 1], lst[j]
+                    swaps += 1
+                    last_swap = j + 1
+            comparisons += hi - lo
+            lo = last_swap
+        self.comparisons += comparisons
+        self.swaps += swaps
+
+    def comb_sort(self):
+        """
+        Compare elements a shrinking gap apart, which moves small elements at the end forward quickly,
+        then finish with bubble passes once the gap reaches 1.
+        """
+        lst, n = self.lst, self.n
+        comparisons = swaps = 0
+        gap = n
+        while gap > 1:
+            gap = int(gap / self.COMB_SHRINK)
+            if gap <= 1:
+                break
+            for j in range(n - gap):
+                if lst[j] > lst[j + gap]:
+                    lst[j], lst[j + gap] = lst[j + gap], lst[j]
+                    swaps += 1
+            comparisons += n - gap
+        self.comparisons += comparisons
+        self.swaps += swaps
+        self.bubble_sort()
+
+    def insertion_sort(self):
+        """Stable in-place insertion sort, counting element shifts as swaps."""
+        lst = self.lst
+        comparisons = swaps = 0
+        for i in range(1, self.n):
+            item = lst[i]
+            j = i - 1
+            while j >= 0:
+                comparisons += 1
+                if not item < lst[j]:
+                    break
+                lst[j + 1] = lst[j]
+                swaps += 1
+                j -= 1
+            lst[j + 1] = item
+        self.comparisons += comparisons
+        self.swaps += swaps
+
+
+CLOSEST_PAIR_BRUTE = 256  # Point sets up to this size are compared all-pairs
+CLOSEST_PAIR_BATCH = 1 << 20  # Candidate pairs whose distances are computed in one array
+
+
+def _closest_pair_brute(points):
+    """
+    Closest pair of a small (n, d) array by comparing all pairs.
+
+    Returns:
+        tuple: (i, j, squared distance) with i < j
+    """
+    i, j = np.triu_indices(len(points), 1)
+    d2 = ((points[i] - points[j]) ** 2).sum(axis=1)
+    best = d2.argmin()
+    return int(i[best]), int(j[best]), float(d2[best])
+
+
+def _neighbor_offsets(d):
+    """
+    Half of the cell offsets in {-1, 0, 1}^d: the nonzero ones whose first nonzero coordinate is
+    positive. With the cell itself they cover every pair of neighbouring cells exactly once.
+
+    Returns:
+        ndarray: (3^d - 1) / 2 offsets of shape (d,)
+    """
+    offsets = np.stack(np.meshgrid(*[[-1, 0, 1]] * d, indexing='ij'), axis=-1).reshape(-1, d)
+    first = np.argmax(offsets != 0, axis=1)
+    return offsets[offsets[np.arange(len(offsets)), first] > 0]
+
+
+def _grid_keys(cells, multipliers):
+    """
+    Hash integer cell coordinates of shape (n, d) to uint64 keys as a sum of coordinate times a random
+    odd multiplier, wrapping modulo 2^64. The hash is linear, so the key of a neighbouring cell is
+    the key plus the hashed offset; collisions only add candidate pairs, never lose any.
+    """
+    return (cells.astype(np.uint64) * multipliers).sum(axis=1, dtype=np.uint64)
+
+
+def _expand_ranges(lo, hi, batch_size):
+    """
+    Expand per-row position ranges [lo[r], hi[r]) (empty where hi <= lo) into pairs of arrays.
+
+    Yields:
+        tuple: (rows, positions) arrays, at most batch_size pairs at a time unless one row has more
+    """
+    counts = np.maximum(hi - lo, 0)
+    total = np.cumsum(counts)
+    start, rows = 0, len(counts)
+    while start < rows:
+        done = total[start - 1] if start else 0
+        stop = max(int(np.searchsorted(total, done + batch_size, 'right')), start + 1)
+        batch_counts = counts[start:stop]
+        size = int(batch_counts.sum())
+        if size:
+            first = np.repeat(np.arange(start, stop), batch_counts)
+            # Position within each row's run of candidates, added to the start of that run
+            within = np.arange(size) - np.repeat(np.cumsum(batch_counts) - batch_counts, batch_counts)
+            yield first, np.repeat(lo[start:stop], batch_counts) + within
+        start = stop
+
+
+def _grid_candidates(sorted_keys, offset_key, same_cell):
+    """
+    For every point (in key order) find the points of the cell at offset_key from its own.
+
+    Yields:
+        tuple: (first, second) arrays of positions in key order, at most CLOSEST_PAIR_BATCH pairs at a time
+    """
+    targets = sorted_keys + offset_key
+    hi = np.searchsorted(sorted_keys, targets, 'right')
+    lo = np.arange(1, len(sorted_keys) + 1) if same_cell else np.searchsorted(sorted_keys, targets, 'left')
+    return _expand_ranges(lo, hi, CLOSEST_PAIR_BATCH)
+
+
+def _grid_axes(points, delta):
+    """
+    Choose the axes a closest-pair grid with cells of side delta is built over. Two points closer than
+    delta are in neighbouring cells of any subset of the axes, so the widest g axes are used with g
+    minimizing the estimated cost 3^g * (1 + points per cell): every neighbouring cell costs a lookup
+    pass, and too few axes crowd the cells.
+
+    Returns:
+        ndarray: Indices of the chosen axes, widest first
+    """
+    n = len(points)
+    span = points.max(axis=0) - points.min(axis=0)
+    axes = np.argsort(span)[::-1]
+    cells = np.cumprod(np.floor(span[axes] / delta) + 1)
+    cost = 3.0 ** np.arange(1, len(axes) + 1) * (1 + n / cells)
+    return axes[:int(cost.argmin()) + 1]
+
+
+def _closest_pair_grid(points, rng):
+    """
+    Randomized grid closest pair of an (n, d) array in expected linear time: the closest distance delta
+    of a random sample of n^(2/3) points bounds the answer, so after hashing every point to its cell
+    of side delta only pairs in the same or neighbouring cells need to be compared. In higher
+    dimensions the cells only span the widest few axes (see _grid_axes), distances use all of them.
+
+    Returns:
+        tuple: (i, j, squared distance) with i < j
+    """
+    n, d = points.shape
+    if n <= CLOSEST_PAIR_BRUTE:
+        return _closest_pair_brute(points)
+    sample = np.sort(rng.choice(n, max(2, int(n ** (2 / 3))), replace=False))
+    i, j, best = _closest_pair_grid(points[sample], rng)
+    i, j = int(sample[i]), int(sample[j])
+    if best == 0:
+        return i, j, 0.0
+
+    delta = math.sqrt(best)
+    axes = _grid_axes(points, delta)
+    # Cell coordinates are only hashed modulo 2^64, and fmod keeps huge ones exact instead of overflowing
+    grid_points = points[:, axes]
+    cells = np.fmod(np.floor((grid_points - grid_points.min(axis=0)) / delta), 2.0 ** 64).astype(np.uint64)
+    multipliers = rng.integers(0, 2 ** 63, size=len(axes), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    keys = _grid_keys(cells, multipliers)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys, sorted_points = keys[order], points[order]
+    offsets = [np.zeros(len(axes), dtype=np.int64)] + list(_neighbor_offsets(len(axes)))
+    for number, offset in enumerate(offsets):
+        offset_key = _grid_keys(offset[None, :], multipliers)[0]
+        for first, second in _grid_candidates(sorted_keys, offset_key, number == 0):
+            d2 = ((sorted_points[first] - sorted_points[second]) ** 2).sum(axis=1)
+            k = d2.argmin()
+            if d2[k] < best:
+                best = float(d2[k])
+                i, j = int(order[first[k]]), int(order[second[k]])
+    return min(i, j), max(i, j), best
+
+
+def closest_pair_numpy(points, method='grid', seed=None):
+    """
+    Find the closest pair of an (n, d) array of points with NumPy.
+
+    Args:
+        points (array_like): Point coordinates, shape (n, d) with n >= 2
+        method (str): 'grid' for randomized grid hashing (expected O(n)), 'kdtree' for a SciPy cKDTree
+        seed (int, optional): Seed of the random sample and hash of the grid method
+
+    Returns:
+        tuple: (i, j, distance) with i < j the row indices of the pair
+
+    Raises:
+        ImportError: If NumPy, or SciPy for the KD-tree, is not installed
+        ValueError: If there are fewer than two points or the method is unknown
+    """
+    if np is None:
+        raise ImportError('closest_pair_numpy requires NumPy')
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points[:, None]
+    if points.ndim != 2 or len(points) < 2:
+        raise ValueError('At least two points of shape (n, d) are required')
+    if method == 'grid':
+        i, j, d2 = _closest_pair_grid(points, np.random.default_rng(seed))
+        return i, j, math.sqrt(d2)
+    if method == 'kdtree':
+        if cKDTree is None:
+            raise ImportError('The kdtree method requires SciPy')
+        distances, neighbors = cKDTree(points).query(points, k=2)
+        i = int(distances[:, 1].argmin())
+        # With duplicate points the query may list the duplicate before the point itself
+        j = int(neighbors[i, 1] if neighbors[i, 1] != i else neighbors[i, 0])
+        return min(i, j), max(i, j), float(distances[i, 1])
+    raise ValueError(f'Unknown method: {method}')
+
+
+def _box_offsets(limits):
+    """
+    All integer offsets o with |o[k]| <= limits[k].
+
+    Returns:
+        ndarray: Offsets of shape (len(limits),)
+    """
+    if len(limits) == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    steps = [range(-int(limit), int(limit) + 1) for limit in limits]
+    return np.stack(np.meshgrid(*steps, indexing='ij'), axis=-1).reshape(-1, len(limits))
+
+
+class SpatialGrid:
+    """
+    Uniform grid index over an (n, d) point set, built once to answer repeated radius and
+    nearest-neighbour queries. Points are bucketed by cell in flat CSR arrays: order lists the point
+    indices cell by cell, cell_keys holds the sorted linear keys of the occupied cells and
+    order[cell_start[c]:cell_start[c + 1]] are the points in cell c.
+
+    Attributes:
+        points (ndarray): Point coordinates, shape (n, d)
+        cell_size (float): Side length of the cells
+        axes (ndarray): Point coordinate axes in the order used for the cells, the longest last
+        cells (ndarray): Cell coordinates of each point in that order, shape (n, d)
+        extent (ndarray): Number of cells along each cell axis
+        strides (ndarray): Key strides of the cell axes, 1 for the last
+        order (ndarray): Point indices sorted by cell
+        cell_keys (ndarray): Linear keys of the occupied cells, ascending
+        cell_start (ndarray): Start of each occupied cell in order, plus n at the end
+    """
+    KNN_BATCH = 1 << 14  # Query points whose nearest neighbours are searched together, at most 2^15
+
+    def __init__(self, points, cell_size=None):
+        """
+        Build the index.
+
+        Args:
+            points (array_like): Point coordinates, shape (n, d)
+            cell_size (float, optional): Cell side, by default chosen for about one point per cell
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If there are no points, or the cells are too small to be numbered in 64 bits
+        """
+        if np is None:
+            raise ImportError('SpatialGrid requires NumPy')
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim == 1:
+            points = points[:, None]
+        if points.ndim != 2 or len(points) == 0:
+            raise ValueError('At least one point of shape (n, d) is required')
+        n, d = points.shape
+        origin = points.min(axis=0)
+        span = points.max(axis=0) - origin
+        if cell_size is None:
+            # About n cells over the axes that are wider than one cell; thinner axes get a single cell
+            spread = span[span > 0]
+            cell_size = 1.0
+            while len(spread):
+                cell_size = float(np.prod(spread / n ** (1 / len(spread))) ** (1 / len(spread)))
+                if spread.min() >= cell_size:
+                    break
+                spread = spread[spread >= cell_size]
+        if cell_size <= 0:
+            raise ValueError('Cell size must be positive')
+        cells = np.floor((points - origin) / cell_size).astype(np.int64)
+        # The longest axis goes last, where a row of cells is one contiguous range of keys
+        self.axes = np.argsort(cells.max(axis=0), kind='stable')
+        cells = cells[:, self.axes]
+        self.extent = cells.max(axis=0) + 1
+        if np.prod(self.extent.astype(np.float64)) >= 2 ** 62:
+            raise ValueError('Cell size is too small for the extent of the points')
+        self.strides = np.append(np.cumprod(self.extent[:0:-1])[::-1], 1).astype(np.int64)
+
+        keys = cells @ self.strides
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, first = np.unique(keys[self.order], return_index=True)
+        self.cell_start = np.append(first, n)
+        self.points = points
+        self.cell_size = cell_size
+        self.cells = cells
+
+    def cell_ranges(self, cells, first=0, last=0):
+        """
+        Look up the cells cells + (0, ..., 0, t) for first <= t <= last. The last coordinate has stride 1,
+        so these cells have consecutive keys and their points are one slice of order.
+
+        Args:
+            cells (ndarray): Cell coordinates, shape (m, d), may lie outside the grid
+            first (int): Smallest offset along the last coordinate
+            last (int): Largest offset along the last coordinate
+
+        Returns:
+            tuple: (lo, hi) arrays, the points of each row of cells are order[lo:hi] (empty if none)
+        """
+        inside = ((cells[:, :-1] >= 0) & (cells[:, :-1] < self.extent[:-1])).all(axis=1)
+        start = np.maximum(cells[:, -1] + first, 0)
+        stop = np.minimum(cells[:, -1] + last, self.extent[-1] - 1)
+        inside &= start <= stop
+        base = cells[:, :-1] @ self.strides[:-1]
+        lo = self.cell_start[np.searchsorted(self.cell_keys, base + start)]
+        hi = self.cell_start[np.searchsorted(self.cell_keys, base + stop, 'right')]
+        return np.where(inside, lo, 0), np.where(inside, hi, 0)
+
+    def pairs_within(self, r, batch_size=CLOSEST_PAIR_BATCH):
+        """
+        Stream every pair of points at most r apart, each pair once.
+
+        Args:
+            r (float): Query radius (must be >= 0)
+            batch_size (int): Candidate pairs checked per batch
+
+        Yields:
+            tuple: (i, j, distance) arrays with i < j, one non-empty batch at a time
+
+        Raises:
+            ValueError: If r is negative
+        """
+        if r < 0:
+            raise ValueError('Radius must not be negative')
+        reach = math.ceil(r / self.cell_size)
+        sorted_cells = self.cells[self.order]
+        # Candidates later in cell order than the point itself, so every pair is produced once
+        after = np.arange(1, len(self.order) + 1)
+        for prefix in _box_offsets(np.minimum(reach, self.extent[:-1] - 1)):
+            # Closest approach of two points whose cells are this far apart
+            gap = np.maximum(np.abs(prefix) - 1, 0) * self.cell_size
+            if (gap ** 2).sum() > r * r:
+                continue
+            lo, hi = self.cell_ranges(sorted_cells + np.append(prefix, 0), -reach, reach)
+            for first, second in _expand_ranges(np.maximum(lo, after), hi, batch_size):
+                i, j = self.order[first], self.order[second]
+                d2 = ((self.points[i] - self.points[j]) ** 2).sum(axis=1)
+                keep = d2 <= r * r
+                if keep.any():
+                    i, j = i[keep], j[keep]
+                    yield np.minimum(i, j), np.maximum(i, j), np.sqrt(d2[keep])
+
+    def band_candidates(self, queries, inner, outer):
+        """
+        Find the points in the cells more than inner and at most outer cells (in the largest coordinate)
+        from each query's cell.
+
+        Yields:
+            tuple: (rows, candidates) arrays, positions in queries and point indices
+        """
+        cells = self.cells[queries]
+        for prefix in _box_offsets(np.minimum(outer, self.extent[:-1] - 1)):
+            shifted = cells + np.append(prefix, 0)
+            if np.abs(prefix).max(initial=0) > inner:
+                spans = [(-outer, outer)]  # The whole row lies in the band
+            else:
+                spans = [(-outer, -inner - 1), (inner + 1, outer)]
+            for first, last in spans:
+                lo, hi = self.cell_ranges(shifted, first, last)
+                for rows, positions in _expand_ranges(lo, hi, CLOSEST_PAIR_BATCH):
+                    yield rows, self.order[positions]
+
+    def knn(self, k):
+        """
+        Find the k nearest other points of every point. Bands of cells of growing width around each
+        point are searched outwards until the k-th best distance found is no larger than the distance
+        to the next band.
+
+        Args:
+            k (int): Number of neighbours (1 <= k < n)
+
+        Returns:
+            tuple: (indices, distances) arrays of shape (n, k), nearest first
+
+        Raises:
+            ValueError: If k is out of range
+        """
+        n, d = self.points.shape
+        if not 1 <= k < n:
+            raise ValueError('k must be between 1 and n - 1')
+        indices = np.empty((n, k), dtype=np.int64)
+        distances = np.empty((n, k))
+        largest_reach = int(self.extent.max())
+        # With about one point per cell, the first box holds around 2k cells
+        start_reach = math.ceil(((2 * k) ** (1 / d) - 1) / 2)
+        for batch_start in range(0, n, self.KNN_BATCH):
+            batch = self.order[batch_start:batch_start + self.KNN_BATCH]  # In cell order, so lookups stay local
+            active = np.arange(len(batch))
+            # Best candidates so far as flat (row in batch, candidate, squared distance) arrays, grouped by row
+            r = c = rank = np.empty(0, dtype=np.int64)
+            d2 = np.empty(0)
+            inner, reach = -1, start_reach
+            while active.size:
+                found = list(self.band_candidates(batch[active], inner, reach))
+                new_r = np.concatenate([active[rows] for rows, _ in found] + [np.empty(0, dtype=np.int64)])
+                new_c = np.concatenate([candidates for _, candidates in found] + [np.empty(0, dtype=np.int64)])
+                other = batch[new_r] != new_c
+                if other.any():
+                    new_r, new_c = new_r[other], new_c[other]
+                    r = np.concatenate([r, new_r])
+                    c = np.concatenate([c, new_c])
+                    d2 = np.concatenate([d2, ((self.points[batch[new_r]] - self.points[new_c]) ** 2).sum(axis=1)])
+
+                    # Keep the k best of every row: sort by distance, then stably by row (a radix sort on int16)
+                    ranked = np.argsort(d2)
+                    ranked = ranked[np.argsort(r[ranked].astype(np.int16), kind='stable')]
+                    r, c, d2 = r[ranked], c[ranked], d2[ranked]
+                    group_start = np.flatnonzero(np.r_[True, r[1:] != r[:-1]])
+                    rank = np.arange(len(r)) - np.repeat(group_start, np.diff(np.append(group_start, len(r))))
+                    keep = rank < k
+                    r, c, d2, rank = r[keep], c[keep], d2[keep], rank[keep]
+
+                # Every point outside the searched bands is more than reach cells away
+                last = rank == k - 1
+                finished = r[last][d2[last] <= (reach * self.cell_size) ** 2]
+                if reach >= largest_reach:
+                    finished = active
+                is_finished = np.zeros(len(batch), dtype=bool)
+                is_finished[finished] = True
+                done = is_finished[r]
+                indices[batch[finished]] = c[done].reshape(-1, k)
+                distances[batch[finished]] = np.sqrt(d2[done]).reshape(-1, k)
+                r, c, d2, rank = r[~done], c[~done], d2[~done], rank[~done]
+                active = active[~is_finished[active]]
+                inner, reach = reach, reach + 1 + reach // 2
+        return indices, distances
+
 
 class ClosestPair:
     """
@@ -158,6 +1632,14 @@ class ClosestPair:
         if n < 2:
             raise ValueError('n must be greater than 1')
         self.points = self.generate_random_points(n)
+        self._index = None
+
+    @property
+    def index(self):
+        """SpatialGrid: Grid index over the points, built on first access."""
+        if self._index is None:
+            self._index = SpatialGrid(self.points)
+        return self._index
 
     @staticmethod
     def distance_square(p1, p2):
@@ -165,12 +1647,12 @@ class ClosestPair:
         Calculate squared Euclidean distance between two points.
         
         Args:
-            p1, p2 (tuple): Points as (x, y) coordinates
+            p1, p2 (tuple): Points as (x, y) or higher-dimensional coordinates
             
         Returns:
             float: Squared distance between points
         """
-        return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
+        return sum((a - b) ** 2 for a, b in zip(p1, p2))
 
     @staticmethod
     def generate_random_points(n, x_range=(0, 100), y_range=(0, 100)):
@@ -259,11 +1741,465 @@ class ClosestPair:
         points_sorted_y = sorted(self.points, key=lambda x: x[1])
         return self.closest_recursive(points_sorted_x, points_sorted_y)
 
+    def find_closest_pair_numpy(self, method='grid'):
+        """
+        Find the closest pair with closest_pair_numpy, see there. Returns the same format as
+        find_closest_pair, which stays available to validate the result.
+
+        Args:
+            method (str): 'grid' or 'kdtree'
+
+        Returns:
+            tuple: (closest_pair, squared_distance)
+        """
+        i, j, distance = closest_pair_numpy(self.points, method)
+        return (self.points[i], self.points[j]), distance ** 2
+
+    def pairs_within(self, r, batch_size=CLOSEST_PAIR_BATCH):
+        """
+        Stream the pairs of points at most r apart from the cached grid index, see SpatialGrid.pairs_within.
+
+        Yields:
+            tuple: (i, j, distance) arrays of point indices with i < j
+        """
+        return self.index.pairs_within(r, batch_size)
+
+    def k_nearest(self, k):
+        """
+        Find the k nearest neighbours of every point from the cached grid index, see SpatialGrid.knn.
+
+        Returns:
+            tuple: (indices, distances) arrays of shape (n, k)
+        """
+        return self.index.knn(k)
+
+
+class StreamingClosestPair:
+    """
+    Maintains the closest pair of a stream of d-dimensional points without recomputing it from scratch.
+    Points are bucketed in a dictionary grid whose cells are at least as wide as the current closest
+    distance, so a new point only needs to be compared with the points in neighbouring cells. The
+    grid is rebuilt when the closest distance falls below half the cell size, which happens at most
+    O(log) times for any useful stream. Like the NumPy grid, cells only span the widest GRID_AXES axes.
+
+    Attributes:
+        points (list): Points added so far, as tuples of floats
+        pair (tuple): Indices (i, j), i < j, of the closest pair, None before the second point
+        distance (float): Distance of the closest pair, infinity before the second point
+    """
+    GRID_AXES = 3  # Neighbouring cells grow as 3^axes, so high-dimensional streams use a projection
+
+    def __init__(self, points=()):
+        """
+        Initialize the stream, optionally with initial points.
+
+        Args:
+            points (iterable): Points added in order
+        """
+        self.points = []
+        self.pair = None
+        self.distance = math.inf
+        self.cell_size = None
+        self.axes = ()
+        self.grid = {}
+        self.offsets = ()
+        self.extend(points)
+
+    def cell(self, point):
+        """Grid cell of a point, over the grid axes."""
+        return tuple(math.floor(point[axis] / self.cell_size) for axis in self.axes)
+
+    def rebuild(self):
+        """Rebuild the grid with cells as wide as the current closest distance."""
+        self.cell_size = self.distance
+        dimensions = len(self.points[0])
+        span = [max(p[axis] for p in self.points) - min(p[axis] for p in self.points) for axis in range(dimensions)]
+        self.axes = sorted(range(dimensions), key=lambda axis: -span[axis])[:self.GRID_AXES]
+        self.offsets = self.neighbor_offsets(len(self.axes))
+        self.grid = {}
+        for index, point in enumerate(self.points):
+            self.grid.setdefault(self.cell(point), []).append(index)
+
+    @staticmethod
+    def neighbor_offsets(dimensions):
+        """All offsets in {-1, 0, 1}^dimensions as tuples."""
+        offsets = [()]
+        for _ in range(dimensions):
+            offsets = [offset + (step,) for offset in offsets for step in (-1, 0, 1)]
+        return offsets
+
+    def add(self, point):
+        """
+        Add a point and update the closest pair.
+
+        Args:
+            point (sequence): Point coordinates
+
+        Returns:
+            tuple: (i, j, distance) of the closest pair so far, None while there is only one point
+
+        Raises:
+            ValueError: If the point's dimension differs from the earlier points
+        """
+        point = tuple(map(float, point))
+        if self.points and len(point) != len(self.points[0]):
+            raise ValueError('All points must have the same dimension')
+        index = len(self.points)
+        self.points.append(point)
+        if index == 0:
+            return None
+        if index == 1:
+            self.pair, self.distance = (0, 1), math.dist(self.points[0], point)
+            if self.distance > 0:
+                self.rebuild()
+            return self.closest()
+        if self.distance == 0:  # A duplicate was seen, nothing can get closer
+            return self.closest()
+
+        cell = self.cell(point)
+        best, pair = self.distance, None
+        for offset in self.offsets:
+            for other in self.grid.get(tuple(c + o for c, o in zip(cell, offset)), ()):
+                distance = math.dist(point, self.points[other])
+                if distance < best:
+                    best, pair = distance, (other, index)
+        if pair is not None:
+            self.pair, self.distance = pair, best
+            if best == 0:
+                self.grid = {}
+                return self.closest()
+            if best < self.cell_size / 2:
+                self.rebuild()  # Also inserts the new point
+                return self.closest()
+        self.grid.setdefault(cell, []).append(index)
+        return self.closest()
+
+    def extend(self, points):
+        """
+        Add several points in order.
+
+        Returns:
+            tuple: (i, j, distance) of the closest pair so far, None with fewer than two points
+        """
+        for point in points:
+            self.add(point)
+        return self.closest()
+
+    def closest(self):
+        """
+        Return the current closest pair.
+
+        Returns:
+            tuple: (i, j, distance), None with fewer than two points
+        """
+        if self.pair is None:
+            return None
+        return self.pair[0], self.pair[1], self.distance
+
+
+SEGMENT_SIZE = 1 << 18  # Odd numbers per sieve segment, 256 KiB of flags stays inside the L2 cache
+_FLAGS_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _base_primes(limit):
+    """
+    Return all primes <= limit with a plain bytearray sieve; used to cross off segments.
+
+    Args:
+        limit (int): Upper bound (inclusive)
+
+    Returns:
+        list: Primes up to limit in ascending order
+    """
+    if limit < 2:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return list(compress(range(limit + 1), sieve))
+
+
+def _sieve_odd_segment(lo, count, base_primes):
+    """
+    Sieve the odd numbers lo, lo + 2, ..., lo + 2 * (count - 1) with one byte flag per number.
+
+    Args:
+        lo (int): First odd number of the segment (must be >= 3)
+        count (int): Number of odd numbers in the segment
+        base_primes (list): All primes up to at least sqrt of the segment end
+
+    Returns:
+        bytearray: Flags where entry i is 1 if lo + 2i is prime
+    """
+    segment = bytearray([1]) * count
+    hi = lo + 2 * count
+    for p in base_primes:
+        if p == 2:
+            continue
+        if p * p >= hi:
+            break
+        first = max(p * p, (lo + p - 1) // p * p)
+        if first % 2 == 0:  # Skip to the next odd multiple
+            first += p
+        # Consecutive odd multiples of p are 2p apart, that is p flags apart
+        start = (first - lo) // 2
+        segment[start::p] = bytes(len(range(start, count, p)))
+    return segment
+
+
+def _pack_flags(flags):
+    """Pack a bytearray of 0/1 flags into bits, flag i becoming bit i % 8 of byte i // 8."""
+    if not flags:
+        return b""
+    return int(flags.translate(_FLAGS_TO_BITS)[::-1], 2).to_bytes((len(flags) + 7) // 8, "little")
+
+
+def _iter_prime_range(lo, hi, segment_size):
+    """Generator behind iter_primes, see there."""
+    if lo <= 2 < hi:
+        yield 2
+    start = max(lo, 3) | 1
+    base_primes = _base_primes(math.isqrt(hi - 1)) if start < hi else []
+    while start < hi:
+        count = min(segment_size, (hi - start + 1) // 2)
+        segment = _sieve_odd_segment(start, count, base_primes)
+        yield from compress(range(start, start + 2 * count, 2), segment)
+        start += 2 * count
+
+
+def iter_primes(lo, hi, segment_size=SEGMENT_SIZE):
+    """
+    Lazily generate the primes in [lo, hi) with a segmented sieve over odd numbers only.
+    Memory is bounded by one segment plus the base primes up to sqrt(hi), however wide the range.
+
+    Args:
+        lo (int): Lower bound (inclusive)
+        hi (int): Upper bound (exclusive)
+        segment_size (int): Number of odd numbers sieved per segment
+
+    Returns:
+        generator: Primes in ascending order
+
+    Raises:
+        ValueError: If the range or the segment size is invalid
+    """
+    if lo < 0 or hi < lo:
+        raise ValueError('Invalid range')
+    if segment_size < 1:
+        raise ValueError('Segment size must be positive')
+    return _iter_prime_range(lo, hi, segment_size)
+
+
+PARALLEL_SHARD_SIZE = 16 * SEGMENT_SIZE  # Odd numbers handed to one worker task
+
+_worker_base_primes = None  # Set in each pool process by _init_sieve_worker
+_worker_shms = []
+
+
+def _init_sieve_worker(base_name, base_count, out_name):
+    """Attach a pool process to the shared base primes and, if given, the shared output flags."""
+    global _worker_base_primes
+    base_shm = shared_memory.SharedMemory(name=base_name)
+    _worker_shms.append(base_shm)
+    _worker_base_primes = base_shm.buf.cast("I")[:base_count]
+    if out_name is not None:
+        _worker_shms.append(shared_memory.SharedMemory(name=out_name))
+
+
+def _sieve_shard(lo, count, offset):
+    """
+    Sieve the odd numbers lo, lo + 2, ... (count of them) in a pool process, one segment at a time.
+    If the pool has an output block, the flags are copied into it starting at offset.
+
+    Returns:
+        int: Number of primes in the shard
+    """
+    out = _worker_shms[1].buf if len(_worker_shms) > 1 else None
+    primes = 0
+    for first in range(0, count, SEGMENT_SIZE):
+        size = min(SEGMENT_SIZE, count - first)
+        segment = _sieve_odd_segment(lo + 2 * first, size, _worker_base_primes)
+        if out is not None:
+            out[offset + first:offset + first + size] = segment
+        primes += segment.count(1)
+    return primes
+
+
+def _parallel_windows(lo, hi, workers, shard_size, collect):
+    """
+    Sieve the odd numbers of [lo, hi) (from 3 on) on a process pool, one window of
+    workers * shard_size numbers at a time. The base primes are put into shared memory once;
+    with `collect` the workers also write their flags into a shared window buffer.
+
+    Yields:
+        tuple: (first odd number of the window, number of primes, flags memoryview or None)
+    """
+    start = max(lo, 3) | 1
+    total = (hi - start + 1) // 2 if start < hi else 0
+    if total == 0:
+        return
+    base = array("I", _base_primes(math.isqrt(hi - 1)))
+    window = min(total, workers * shard_size)
+    base_shm = shared_memory.SharedMemory(create=True, size=max(4, len(base) * base.itemsize))
+    out_shm = shared_memory.SharedMemory(create=True, size=window) if collect else None
+    try:
+        base_shm.buf[:len(base) * base.itemsize] = base.tobytes()
+        initargs = (base_shm.name, len(base), out_shm.name if collect else None)
+        with ProcessPoolExecutor(workers, initializer=_init_sieve_worker, initargs=initargs) as pool:
+            for first in range(0, total, window):
+                size = min(window, total - first)
+                futures = [pool.submit(_sieve_shard, start + 2 * (first + f), min(shard_size, size - f), f)
+                           for f in range(0, size, shard_size)]
+                primes = sum(future.result() for future in futures)
+                if collect:
+                    with out_shm.buf[:size] as flags:
+                        yield start + 2 * first, primes, flags
+                else:
+                    yield start + 2 * first, primes, None
+    finally:
+        for shm in (base_shm, out_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def _iter_parallel_primes(lo, hi, workers, shard_size):
+    """Generator behind parallel_primes, see there."""
+    if lo <= 2 < hi:
+        yield 2
+    for window_lo, _, flags in _parallel_windows(lo, hi, workers, shard_size, collect=True):
+        yield from compress(range(window_lo, window_lo + 2 * len(flags), 2), flags)
+
+
+def parallel_primes(lo, hi, workers=None, shard_size=PARALLEL_SHARD_SIZE):
+    """
+    Generate the primes in [lo, hi) with the segmented sieve spread over a process pool.
+    Workers share the base primes and write their flags into a shared memory window, so no lists
+    of primes are pickled between processes. Small ranges are sieved in-process.
+
+    Args:
+        lo (int): Lower bound (inclusive)
+        hi (int): Upper bound (exclusive)
+        workers (int, optional): Number of processes, defaults to the CPU count
+        shard_size (int): Number of odd numbers sieved per worker task
+
+    Returns:
+        generator: Primes in ascending order
+
+    Raises:
+        ValueError: If the range or the shard size is invalid
+    """
+    if lo < 0 or hi < lo:
+        raise ValueError('Invalid range')
+    if shard_size < 1:
+        raise ValueError('Shard size must be positive')
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or hi - lo <= 2 * shard_size:
+        return iter_primes(lo, hi)
+    return _iter_parallel_primes(lo, hi, workers, shard_size)
+
+
+def count_primes(hi, lo=0, workers=None, shard_size=PARALLEL_SHARD_SIZE):
+    """
+    Count the primes in [lo, hi) with the parallel segmented sieve. Workers only return
+    their counts, so no primes are ever collected.
+
+    Args:
+        hi (int): Upper bound (exclusive)
+        lo (int): Lower bound (inclusive)
+        workers (int, optional): Number of processes, defaults to the CPU count
+        shard_size (int): Number of odd numbers sieved per worker task
+
+    Returns:
+        int: Number of primes p with lo <= p < hi
+
+    Raises:
+        ValueError: If the range or the shard size is invalid
+    """
+    if lo < 0 or hi < lo:
+        raise ValueError('Invalid range')
+    if shard_size < 1:
+        raise ValueError('Shard size must be positive')
+    workers = workers or os.cpu_count() or 1
+    count = 1 if lo <= 2 < hi else 0
+    if workers > 1 and hi - lo > 2 * shard_size:
+        return count + sum(primes for _, primes, _ in _parallel_windows(lo, hi, workers, shard_size, collect=False))
+    # In-process: count the flags of each segment instead of generating the primes
+    start = max(lo, 3) | 1
+    total = (hi - start + 1) // 2 if start < hi else 0
+    base_primes = _base_primes(math.isqrt(hi - 1)) if total else []
+    for first in range(0, total, SEGMENT_SIZE):
+        count += _sieve_odd_segment(start + 2 * first, min(SEGMENT_SIZE, total - first), base_primes).count(1)
+    return count
+
+
+def _lucy_python(x, r, primes):
+    """Lucy_Hedgehog prime counting on plain lists, see prime_count."""
+    small = [v - 1 for v in range(r + 1)]  # small[v] = S(v)
+    large = [0] + [x // i - 1 for i in range(1, r + 1)]  # large[i] = S(x // i)
+    for sp, p in enumerate(primes):  # sp = number of primes below p
+        p2 = p * p
+        for i in range(1, min(r, x // p2) + 1):
+            d = i * p
+            large[i] -= (large[d] if d <= r else small[x // d]) - sp
+        for v in range(r, p2 - 1, -1):
+            small[v] -= small[v // p] - sp
+    return large[1]
+
+
+def _lucy_numpy(x, r, primes):
+    """Lucy_Hedgehog prime counting with NumPy arrays, see prime_count."""
+    small = np.arange(-1, r, dtype=np.int64)
+    large = np.empty(r + 1, dtype=np.int64)
+    large[0] = 0
+    large[1:] = x // np.arange(1, r + 1, dtype=np.int64) - 1
+    for sp, p in enumerate(primes):
+        p2 = p * p
+        m = min(r, x // p2)
+        k = min(m, r // p)  # large[1..k] read large[i * p], the rest read small[x // (i * p)]
+        # The right-hand sides are evaluated before the update, so old values are read as in the scalar loop
+        large[1:k + 1] -= large[p:k * p + 1:p] - sp
+        if m > k:
+            large[k + 1:m + 1] -= small[x // (np.arange(k + 1, m + 1, dtype=np.int64) * p)] - sp
+        if p2 <= r:
+            small[p2:] -= small[np.arange(p2, r + 1, dtype=np.int64) // p] - sp
+    return int(large[1])
+
+
+def prime_count(x):
+    """
+    Count the primes <= x without sieving up to x, using the Lucy_Hedgehog algorithm.
+    It keeps S(v) = number of primes <= v only for the O(sqrt(x)) values v = x // i, and removes
+    the multiples of each prime p <= sqrt(x) from them in turn, for O(x^(3/4)) time and
+    O(sqrt(x)) memory. With NumPy each prime is one vectorized update, so x = 10^12 takes seconds.
+
+    Args:
+        x (int): Upper bound (inclusive)
+
+    Returns:
+        int: Number of primes p <= x
+
+    Raises:
+        ValueError: If x is negative
+    """
+    if x < 0:
+        raise ValueError('x must be non-negative')
+    if x < 2:
+        return 0
+    r = math.isqrt(x)
+    primes = _base_primes(r)
+    if np is not None and x < 2 ** 62:
+        return _lucy_numpy(x, r, primes)
+    return _lucy_python(x, r, primes)
+
 
 class SieveOfEratosthenes:
     """
     Implements the Sieve of Eratosthenes algorithm for finding all prime numbers
-    up to a given limit.
+    up to a given limit. The numbers are sieved in cache-sized segments of odd numbers, and the
+    list of primes and the bit-packed lookup table are only built when first needed.
     """
 
     def __init__(self, n):
@@ -279,23 +2215,70 @@ class SieveOfEratosthenes:
         if n < 2:
             raise ValueError('N must be at least 2')
         self.n = n
-        self.primes = self.sieve_of_eratosthenes()
+        self._primes = None
+        self._bits = None
+
+    def __iter__(self):
+        """Stream the primes <= n without materializing them."""
+        return iter_primes(2, self.n + 1)
+
+    @property
+    def primes(self):
+        """list: All prime numbers <= n, computed on first access."""
+        if self._primes is None:
+            self._primes = self.sieve_of_eratosthenes()
+        return self._primes
 
     def sieve_of_eratosthenes(self):
         """
-        Generate primes using the Sieve of Eratosthenes algorithm.
+        Generate primes using the segmented Sieve of Eratosthenes.
         
         Returns:
             list: List of prime numbers <= n
         """
-        sieve = bytearray([1]) * (self.n + 1)
-        sieve[0] = sieve[1] = 0
+        return list(iter_primes(2, self.n + 1))
+
+    def bit_table(self):
+        """
+        Build the odd-only, bit-packed primality table, one bit per odd number
+        (16 times smaller than a byte per integer).
+
+        Returns:
+            bytes: Table where bit i % 8 of byte i // 8 is set if 2i + 1 is prime
+        """
+        if self._bits is None:
+            base_primes = _base_primes(math.isqrt(self.n))
+            count = (self.n + 1) // 2  # Odd numbers 1, 3, ..., up to n
+            chunks = []
+            for first in range(0, count, SEGMENT_SIZE):
+                size = min(SEGMENT_SIZE, count - first)
+                if first == 0:  # Entry 0 is the number 1, sieve from 3 and mark 1 as not prime
+                    segment = bytearray(1) + _sieve_odd_segment(3, size - 1, base_primes)
+                else:
+                    segment = _sieve_odd_segment(2 * first + 1, size, base_primes)
+                chunks.append(_pack_flags(segment))
+            self._bits = b"".join(chunks)
+        return self._bits
 
-        for i in range(2, int(math.sqrt(self.n)) + 1):
-            if sieve[i]:
-                sieve[i*i::i] = b'\x00' * len(sieve[i*i::i])
+    def is_prime(self, k):
+        """
+        Check whether k is prime using the bit-packed table.
+
+        Args:
+            k (int): Number to check (must be <= n)
 
-        return [i for i, is_prime in enumerate(sieve) if is_prime]
+        Returns:
+            bool: True if k is prime
+
+        Raises:
+            ValueError: If k is outside the sieved range
+        """
+        if k < 0 or k > self.n:
+            raise ValueError('k must be between 0 and n')
+        if k % 2 == 0:
+            return k == 2
+        i = k // 2
+        return bool(self.bit_table()[i >> 3] >> (i & 7) & 1)
 
 
 if __name__ == "__main__":
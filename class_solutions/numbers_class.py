@@ -1,80 +1,617 @@
 import math
+import mmap
+import os
+import random
+import threading
+import time
+from array import array
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, msvcrt provides the file lock there
+    fcntl = None
+    import msvcrt
+
+try:
+    import gmpy2
+except ImportError:  # gmpy2 is optional, plain Python ints are used without it
+    gmpy2 = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, it is used to accept and return arrays and for batch validation
+    np = None
+
+from classicalalgorithms_class import SieveOfEratosthenes
+
+_mpz = gmpy2.mpz if gmpy2 is not None else int
+_isqrt = gmpy2.isqrt if gmpy2 is not None else math.isqrt
+
+_STR_CHUNK_DIGITS = 2000  # Stays below the interpreter's int -> str conversion limit
+
+
+def _int_to_str(x):
+    """
+    Convert a non-negative integer of any size to its decimal string.
+
+    Plain ints are split recursively on powers of ten, which avoids the interpreter's
+    int -> str digit limit and is faster than a single quadratic conversion.
+
+    Args:
+        x (int): The integer to convert
+
+    Returns:
+        str: Decimal representation of x
+    """
+    if gmpy2 is not None:
+        return str(_mpz(x))
+    if x < 10 ** _STR_CHUNK_DIGITS:
+        return str(x)
+    half = int(x.bit_length() * math.log10(2)) // 2
+    high, low = divmod(x, 10 ** half)
+    return _int_to_str(high) + _int_to_str(low).zfill(half)
+
+
+def _lock_file(f):
+    """Take an exclusive lock on an open file, blocking until it is available."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f):
+    """Release a lock taken with _lock_file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _round_digits(digits, n):
+    """
+    Round a truncated digit string with n + 1 decimal places to n decimal places.
+
+    Args:
+        digits (str): Integer digit followed by at least n + 1 decimal places, without a point
+        n (int): Number of decimal places to keep
+
+    Returns:
+        Decimal: The rounded value
+    """
+    with localcontext() as ctx:
+        ctx.prec = n + 3
+        return Decimal(digits[0] + "." + digits[1:n + 2]).quantize(Decimal(10) ** -n, rounding=ROUND_HALF_UP)
+
+
+class _BinarySplittingSeries:
+    """
+    Shared machinery for constants evaluated as a rational series with binary splitting.
+    Subclasses describe a single term, how two adjacent ranges merge and how to turn the merged
+    state into digits. The merged state of terms [0, terms) is kept between calls, so asking for
+    more digits only evaluates the new terms and merges them on the right.
+
+    Attributes:
+        terms (int): Number of series terms merged into the state so far
+        state (tuple): Binary-splitting products for the terms [0, terms)
+    """
+    GUARD_DIGITS = 10  # Extra digits computed and discarded to absorb truncation error
+
+    def __init__(self):
+        self.terms = 0
+        self.state = None
+        self._lock = threading.Lock()
+
+    def _term(self, k):
+        """Return the binary-splitting products of the single term k."""
+        raise NotImplementedError
+
+    def _merge(self, left, right):
+        """Combine the products of two adjacent term ranges, left one first."""
+        raise NotImplementedError
+
+    def _terms_for(self, precision):
+        """Return the number of terms needed for `precision` correct digits."""
+        raise NotImplementedError
+
+    def _scaled(self, state, precision):
+        """Return floor(constant * 10**precision) computed from the merged state."""
+        raise NotImplementedError
+
+    def _split(self, a, b):
+        """
+        Recursively evaluate the series terms [a, b) with binary splitting.
+
+        Returns:
+            tuple: The merged products for the range
+        """
+        if b - a == 1:
+            return self._term(a)
+        m = (a + b) // 2
+        return self._merge(self._split(a, m), self._split(m, b))
+
+    def extend(self, terms):
+        """
+        Merge series terms into the state until it holds at least `terms` terms.
+
+        Args:
+            terms (int): Required number of series terms
+        """
+        with self._lock:
+            if terms <= self.terms:
+                return
+            products = self._split(self.terms, terms)
+            self.state = products if self.terms == 0 else self._merge(self.state, products)
+            self.terms = terms
+
+    def digits(self, n):
+        """
+        Calculate the integer part of the constant followed by n decimal places, truncated.
+
+        Args:
+            n (int): Number of decimal places
+
+        Returns:
+            str: The digits without a decimal point, e.g. "314" for π and n=2
+        """
+        precision = n + self.GUARD_DIGITS
+        self.extend(self._terms_for(precision))
+        with self._lock:
+            state = self.state
+        return _int_to_str(self._scaled(state, precision))[:n + 1]
+
+    def value(self, n):
+        """
+        Calculate the constant rounded to n decimal places.
+
+        Args:
+            n (int): Number of decimal places
+
+        Returns:
+            Decimal: The constant rounded to n decimal places
+        """
+        return _round_digits(self.digits(n + 1), n)
+
+    def stream(self, n, block_size=1000):
+        """
+        Yield the first n decimal places in blocks as they become available.
+        Precision doubles from one stage to the next and each stage only adds the new series terms,
+        so the first blocks arrive long before the full result is known.
+
+        Args:
+            n (int): Total number of decimal places to produce
+            block_size (int): Number of digits per yielded block (the last block may be shorter)
+
+        Yields:
+            str: Consecutive blocks of decimal places, starting right after the decimal point
+
+        Raises:
+            ValueError: If block_size is not positive
+        """
+        if block_size < 1:
+            raise ValueError("The block size must be a positive integer.")
+        emitted = 0
+        precision = block_size
+        while emitted < n:
+            precision = min(n, precision)
+            decimals = self.digits(precision)[1:]
+            ready = precision if precision == n else precision - precision % block_size
+            for start in range(emitted, ready, block_size):
+                yield decimals[start:min(start + block_size, ready)]
+            emitted = ready
+            precision *= 2
+
+
+class ChudnovskyPi(_BinarySplittingSeries):
+    """
+    An arbitrary-precision π engine using the Chudnovsky series evaluated with binary splitting.
+    Each series term adds roughly 14 correct digits.
+
+    Attributes:
+        terms (int): Number of series terms merged into the state so far
+        state (tuple): (P, Q, T) products for the terms [0, terms)
+    """
+    C3_OVER_24 = 640320 ** 3 // 24
+    DIGITS_PER_TERM = math.log10(C3_OVER_24 / 72)
+
+    def _term(self, k):
+        if k == 0:
+            p = q = _mpz(1)
+        else:
+            p = _mpz((6 * k - 5) * (2 * k - 1) * (6 * k - 1))
+            q = _mpz(k) ** 3 * self.C3_OVER_24
+        t = p * (13591409 + 545140134 * k)
+        if k & 1:  # Terms alternate in sign
+            t = -t
+        return p, q, t
+
+    def _merge(self, left, right):
+        p1, q1, t1 = left
+        p2, q2, t2 = right
+        return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+    def _terms_for(self, precision):
+        return int(precision / self.DIGITS_PER_TERM) + 2
+
+    def _scaled(self, state, precision):
+        _, q, t = state
+        one = _mpz(10) ** precision
+        return q * 426880 * _isqrt(10005 * one * one) // t
+
+
+class EulerSeries(_BinarySplittingSeries):
+    """
+    An arbitrary-precision e engine summing 1/k! with binary splitting on integers.
+    Term k is the step from 1/k! to 1/(k+1)!, so the state of the terms [0, N) satisfies
+    e = 1 + P / Q, and asking for 2n digits after n digits only multiplies in the missing factorials.
+
+    Attributes:
+        terms (int): Number of series terms merged into the state so far
+        state (tuple): (P, Q) products for the terms [0, terms)
+    """
+
+    def _term(self, k):
+        return _mpz(1), _mpz(k + 1)
+
+    def _merge(self, left, right):
+        p1, q1 = left
+        p2, q2 = right
+        return p1 * q2 + p2, q1 * q2
+
+    def _terms_for(self, precision):
+        # Smallest N with N! > 10**(precision + 1), found by bisection on lgamma
+        target = (precision + 1) * math.log(10)
+        low, high = 1, 2
+        while math.lgamma(high + 1) <= target:
+            high *= 2
+        while low < high:
+            mid = (low + high) // 2
+            if math.lgamma(mid + 1) > target:
+                high = mid
+            else:
+                low = mid + 1
+        return low + 1
+
+    def _scaled(self, state, precision):
+        p, q = state
+        return (p + q) * _mpz(10) ** precision // q
+
+
+class DigitCache:
+    """
+    A persistent on-disk cache of the decimal places of a constant computed by a series engine.
+    The file holds the decimal places as raw ASCII bytes and is memory-mapped, so opening it costs
+    the same regardless of its size and any slice is served without recomputation. The file only
+    ever grows by appending, under an exclusive lock, so readers in other processes keep a valid
+    prefix mapped and pick up the longer file the next time they need it.
+
+    Attributes:
+        path (str): Location of the digit file
+        engine (_BinarySplittingSeries): Engine used to extend the file
+        min_extension (int): Smallest number of decimal places the file is grown to
+        length (int): Number of decimal places currently mapped
+    """
+
+    def __init__(self, path, engine, min_extension=10000):
+        self.path = path
+        self.engine = engine
+        self.min_extension = min_extension
+        self.length = 0
+        self._map = None
+        self._integer_part = None
+        open(path, "ab").close()  # Create the file if it does not exist yet
+        self._refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        """Return one decimal place or a slice of them, e.g. cache[1000:2000]."""
+        if isinstance(index, slice):
+            start, stop, step = index.start or 0, index.stop, index.step
+            if start < 0 or stop is None or stop < 0:
+                raise ValueError("Digit slices need explicit non-negative bounds.")
+            return self.get(start, stop)[::step]
+        if index < 0:
+            raise IndexError("Digit index must be non-negative.")
+        return self.get(index, index + 1)
+
+    def close(self):
+        """Unmap the digit file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.length = 0
+
+    def _refresh(self):
+        """Remap the file if another process or call has made it longer."""
+        size = os.path.getsize(self.path)
+        if size <= self.length:
+            return
+        if self._map is not None:
+            self._map.close()
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.length = size
+
+    def _extend(self, end):
+        """
+        Grow the file to hold at least `end` decimal places, doubling it to amortize the cost.
+        The size is checked again under the lock, since another process may have grown it meanwhile.
+        """
+        with open(self.path + ".lock", "a+b") as lock:
+            _lock_file(lock)
+            try:
+                size = os.path.getsize(self.path)
+                if size < end:
+                    target = max(end, 2 * size, self.min_extension)
+                    decimals = self.engine.digits(target)[1:]
+                    with open(self.path, "ab") as f:
+                        f.write(decimals[size:].encode("ascii"))
+                        f.flush()
+                        os.fsync(f.fileno())
+            finally:
+                _unlock_file(lock)
+        self._refresh()
+
+    def get(self, start, end):
+        """
+        Return the decimal places [start, end), extending the file only if it is too short.
+
+        Args:
+            start (int): Index of the first decimal place (0 is the first digit after the point)
+            end (int): Index one past the last decimal place
+
+        Returns:
+            str: The requested decimal places
+
+        Raises:
+            ValueError: If the range is invalid
+        """
+        if start < 0 or end < start:
+            raise ValueError("Invalid digit range.")
+        if end > self.length:
+            self._refresh()
+            if end > self.length:
+                self._extend(end)
+        return self._map[start:end].decode("ascii") if end > start else ""
+
+    def value(self, n):
+        """
+        Calculate the constant rounded to n decimal places from the cached digits.
+
+        Args:
+            n (int): Number of decimal places
+
+        Returns:
+            Decimal: The constant rounded to n decimal places
+        """
+        if self._integer_part is None:
+            self._integer_part = self.engine.digits(0)
+        return _round_digits(self._integer_part + self.get(0, n + 1), n)
 
 
 class Pi:
     """
-    A class to calculate the value of π to a specified number of decimal places using the Gauss-Legendre algorithm.
-    The algorithm provides quadratic convergence, doubling the number of correct digits with each iteration.
+    A class to calculate the value of π to a specified number of decimal places.
+    A thin wrapper over ChudnovskyPi; all instances share one engine, so later requests
+    reuse the series terms merged by earlier ones.
 
     Attributes:
-        n (int): Number of decimal places to calculate (limited to 100)
-        accuracy (float): The desired accuracy threshold for convergence
-        a, b, t, p (float): Variables used in the Gauss-Legendre algorithm
+        n (int): Number of decimal places to calculate
+        cache (DigitCache): Optional on-disk cache of π digits to read from instead of the engine
     """
+    _engine = ChudnovskyPi()
 
-    def __init__(self, n):
-        if n > 100:
-            raise ValueError("The number of decimal places is limited to 100.")
+    def __init__(self, n, cache=None):
+        if n < 0:
+            raise ValueError("The number of decimal places must be a non-negative integer.")
         self.n = n
-        self.accuracy = 10 ** (-n)  # Set precision threshold
-        self.a = 1.0  # Initial value of a
-        self.b = 1.0 / (2 ** 0.5)  # Initial value of b
-        self.t = 0.25  # Initial value of t
-        self.p = 1.0  # Initial value of power
+        self.cache = cache
 
     def calculate(self):
         """
-        Iteratively applies the Gauss-Legendre algorithm until convergence is achieved.
+        Calculates π with the shared Chudnovsky engine, or reads it from the digit cache if one is set.
 
         Returns:
-            float: The calculated value of π rounded to n decimal places
+            Decimal: The calculated value of π rounded to n decimal places
+        """
+        if self.cache is not None:
+            return self.cache.value(self.n)
+        return self._engine.value(self.n)
+
+    def stream(self, block_size=1000):
         """
-        while abs(self.a - self.b) > self.accuracy:
-            a_next = (self.a + self.b) / 2  # Arithmetic mean
-            self.b = (self.a * self.b) ** 0.5  # Geometric mean
-            self.t -= self.p * ((self.a - a_next) ** 2)  # Update t
-            self.a = a_next  # Update a
-            self.p *= 2  # Double the power
+        Streams the decimal places of π in blocks of block_size digits.
 
-        pi = ((self.a + self.b) ** 2) / (4 * self.t)
-        return round(pi, self.n)
+        Returns:
+            generator: Blocks of decimal places, see _BinarySplittingSeries.stream
+        """
+        return self._engine.stream(self.n, block_size)
 
 
 class E:
     """
     A class to calculate the value of e (Euler's number) to a specified number of decimal places
-    using the Taylor series expansion of e^x where x=1.
+    from the Taylor series of e^x at x=1. A thin wrapper over EulerSeries; all instances share
+    one engine, so later requests reuse the factorial products merged by earlier ones.
 
     Attributes:
-        n (int): Number of decimal places to calculate (limited to 100)
-        accuracy (float): The desired accuracy threshold for convergence
-        e (float): Current approximation of e
-        factorial (float): Running factorial value
-        k (int): Current term index in the series
+        n (int): Number of decimal places to calculate
+        cache (DigitCache): Optional on-disk cache of e digits to read from instead of the engine
     """
+    _engine = EulerSeries()
 
-    def __init__(self, n):
-        if n > 100:
-            raise ValueError("The number of decimal places is limited to 100.")
+    def __init__(self, n, cache=None):
+        if n < 0:
+            raise ValueError("The number of decimal places must be a non-negative integer.")
         self.n = n
-        self.accuracy = 10 ** (-n)
-        self.e = 0.0  # Initialize e
-        self.factorial = 1.0  # 0! = 1
-        self.k = 0  # Term counter
+        self.cache = cache
 
     def taylor_series(self):
         """
-        Recursively calculates e using Taylor series expansion until desired accuracy is achieved.
+        Sums the Taylor series with the shared binary-splitting engine, or reads e from the digit
+        cache if one is set.
+
+        Returns:
+            Decimal: The calculated value of e rounded to n decimal places
+        """
+        if self.cache is not None:
+            return self.cache.value(self.n)
+        return self._engine.value(self.n)
+
+    def stream(self, block_size=1000):
+        """
+        Streams the decimal places of e in blocks of block_size digits.
 
         Returns:
-            float: The calculated value of e rounded to n decimal places
+            generator: Blocks of decimal places, see _BinarySplittingSeries.stream
         """
-        self.e += (1.0 / self.factorial)  # Add current term
-        if (1.0 / self.factorial) < self.accuracy:  # Check for convergence
-            return self.e
-        self.k += 1  # Increment term counter
-        self.factorial *= self.k  # Update factorial
-        return round(self.taylor_series(), self.n)
+        return self._engine.stream(self.n, block_size)
+
+
+PISANO_LIMIT = 10 ** 6  # Largest modulus whose Pisano period is computed and cached
+
+
+def _fib_pair(n, m=None):
+    """
+    Calculate (F(n), F(n+1)) with fast doubling, reading the bits of n from the top.
+    Uses F(2k) = F(k) * (2F(k+1) - F(k)) and F(2k+1) = F(k)² + F(k+1)².
+
+    Args:
+        n (int): Index of the first number of the pair
+        m (int, optional): Reduce every intermediate result modulo m
+
+    Returns:
+        tuple: (F(n), F(n+1)), modulo m if given
+    """
+    a, b = _mpz(0), _mpz(1)
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if m is not None:
+            c, d = c % m, d % m
+        if bit == "1":
+            a, b = d, c + d if m is None else (c + d) % m
+        else:
+            a, b = c, d
+    return a, b
+
+
+@lru_cache(maxsize=128)
+def _pisano_period(m):
+    """
+    Calculate the period of the Fibonacci sequence modulo m (it never exceeds 6m).
+
+    Args:
+        m (int): The modulus
+
+    Returns:
+        int: The Pisano period of m
+    """
+    if m == 1:
+        return 1
+    a, b = 0, 1
+    for period in range(1, 6 * m + 1):
+        a, b = b, (a + b) % m
+        if a == 0 and b == 1:
+            return period
+
+
+def _fib_stream(limit, count, start):
+    """Yield Fibonacci numbers from F(start), stopping at `count` terms or past `limit`."""
+    a, b = _fib_pair(start)
+    emitted = 0
+    while (count is None or emitted < count) and (limit is None or a <= limit):
+        yield int(a)
+        a, b = b, a + b
+        emitted += 1
+
+
+def _chunked(iterable, size):
+    """Yield lists of up to `size` consecutive items from iterable."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_fibonacci(limit=None, count=None, start=0, chunk_size=None):
+    """
+    Lazily generate Fibonacci numbers, holding only the current pair in memory.
+    The first pair is found with fast doubling, so starting deep in the sequence is cheap.
+    With neither limit nor count the sequence is infinite.
+
+    Args:
+        limit (int, optional): Stop before the first number greater than limit
+        count (int, optional): Stop after this many numbers
+        start (int): Index of the first number to yield
+        chunk_size (int, optional): Yield lists of this many numbers instead of single numbers
+
+    Returns:
+        generator: Fibonacci numbers F(start), F(start + 1), ... or chunks of them
+
+    Raises:
+        ValueError: If an argument is negative or chunk_size is not positive
+    """
+    if start < 0 or (limit is not None and limit < 0) or (count is not None and count < 0):
+        raise ValueError("The number must be a non-negative integer.")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("The chunk size must be a positive integer.")
+    terms = _fib_stream(limit, count, start)
+    return terms if chunk_size is None else _chunked(terms, chunk_size)
+
+
+def fib(n):
+    """
+    Calculate the nth Fibonacci number in O(log n) big-integer multiplications.
+
+    Args:
+        n (int): Index of the Fibonacci number (F(0) = 0, F(1) = 1)
+
+    Returns:
+        int: F(n)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("The number must be a non-negative integer.")
+    return int(_fib_pair(n)[0])
+
+
+def fib_mod(n, m):
+    """
+    Calculate the nth Fibonacci number modulo m without ever forming F(n).
+    For moduli up to PISANO_LIMIT, n is first reduced by the cached Pisano period of m.
+
+    Args:
+        n (int): Index of the Fibonacci number
+        m (int): The modulus (must be positive)
+
+    Returns:
+        int: F(n) mod m
+
+    Raises:
+        ValueError: If n is negative or m is not positive
+    """
+    if n < 0:
+        raise ValueError("The number must be a non-negative integer.")
+    if m < 1:
+        raise ValueError("The modulus must be a positive integer.")
+    if m <= PISANO_LIMIT:
+        n %= _pisano_period(m)
+    return int(_fib_pair(n, m)[0])
 
 
 class Fibonacci:
@@ -109,6 +646,18 @@ class Fibonacci:
             self.i += 1  # Increment index
         return self.fib
 
+    def iterate(self, chunk_size=None):
+        """
+        Lazily generates the Fibonacci numbers up to the limit without storing them.
+
+        Args:
+            chunk_size (int, optional): Yield lists of this many numbers instead of single numbers
+
+        Returns:
+            generator: Fibonacci numbers not exceeding n, see iter_fibonacci
+        """
+        return iter_fibonacci(limit=self.n, chunk_size=chunk_size)
+
 
 class FibonacciCalculator:
     """
@@ -130,53 +679,282 @@ class FibonacciCalculator:
         Returns:
             list: The Fibonacci sequence with 'limit' elements
         """
+        return list(iter_fibonacci(count=self.limit))
+
+    def last_term(self):
+        """
+        Calculates the last of the first 'limit' Fibonacci numbers with fast doubling,
+        without building the sequence.
+
+        Returns:
+            int: F(limit - 1)
+
+        Raises:
+            ValueError: If the sequence is empty
+        """
         if self.limit == 0:
-            return []
-        elif self.limit == 1:
-            return [0]
-        fib = [0, 1]  # Initial sequence
-        while len(fib) < self.limit:
-            fib.append(fib[-1] + fib[-2])  # Add next term
-        return fib
+            raise ValueError("The sequence is empty.")
+        return fib(self.limit - 1)
+
+    def iterate(self, start=0, chunk_size=None):
+        """
+        Lazily generates the first 'limit' Fibonacci numbers without storing them.
+
+        Args:
+            start (int): Index of the first number to yield
+            chunk_size (int, optional): Yield lists of this many numbers instead of single numbers
+
+        Returns:
+            generator: 'limit' Fibonacci numbers from F(start), see iter_fibonacci
+        """
+        return iter_fibonacci(count=self.limit, start=start, chunk_size=chunk_size)
+
+
+SMALL_PRIME_LIMIT = 2000
+SMALL_PRIMES = tuple(p for p in range(2, SMALL_PRIME_LIMIT) if all(p % d for d in range(2, math.isqrt(p) + 1)))
+
+# Miller-Rabin with the first 12 prime bases is deterministic below this bound (covers all 64-bit inputs)
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+def _check_deadline(deadline):
+    """Raise TimeoutError once the monotonic deadline (if any) has passed."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("Factorization exceeded its time budget.")
+
+
+def is_probable_prime(n, rounds=8):
+    """
+    Test primality with Miller-Rabin. The answer is exact below 3.3 * 10^24; above that,
+    n is a strong probable prime to the fixed bases and `rounds` random bases.
+
+    Args:
+        n (int): The number to test
+        rounds (int): Number of extra random bases used above the deterministic bound
+
+    Returns:
+        bool: True if n is (probably) prime, False if it is certainly composite
+    """
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES[:len(_MR_BASES)]:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:  # Write n - 1 as d * 2^s with d odd
+        d //= 2
+        s += 1
+    bases = _MR_BASES
+    if n >= _MR_DETERMINISTIC_LIMIT:
+        bases += tuple(random.randrange(2, n - 1) for _ in range(rounds))
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False  # a is a witness that n is composite
+    return True
+
+
+def _pollard_brent(n, deadline=None):
+    """
+    Find a non-trivial factor of an odd composite n with Brent's variant of Pollard's rho.
+    Differences are multiplied together in batches so only one gcd is needed per batch.
+
+    Args:
+        n (int): An odd composite number
+        deadline (float, optional): time.monotonic() value after which to give up
+
+    Returns:
+        int: A factor d of n with 1 < d < n
+
+    Raises:
+        TimeoutError: If the deadline passes before a factor is found
+    """
+    batch = 128
+    while True:
+        y, c = random.randrange(1, n), random.randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+                _check_deadline(deadline)
+            r *= 2
+        if g == n:  # The batch overshot, step back through it one gcd at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:  # Otherwise retry with a different polynomial
+            return g
+
+
+def factorize(n, timeout=None):
+    """
+    Factorize n with small-prime trial division, Miller-Rabin and Pollard-Brent rho.
+
+    Args:
+        n (int): The number to factorize (must be > 1)
+        timeout (float, optional): Time budget in seconds, None for no limit
+
+    Returns:
+        list: (prime, exponent) pairs in ascending order of the prime
+
+    Raises:
+        ValueError: If n < 2
+        TimeoutError: If the factorization does not finish within the time budget
+    """
+    if n < 2:
+        raise ValueError("The number must be a positive integer greater than 1.")
+    deadline = None if timeout is None else time.monotonic() + timeout
+    powers = {}
+
+    # Strip the small primes first
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            powers[p] = powers.get(p, 0) + 1
+            n //= p
+
+    # Split the remaining cofactors until all of them are prime
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if m < SMALL_PRIME_LIMIT ** 2 or is_probable_prime(m):  # No small factor left, so m is prime
+            powers[m] = powers.get(m, 0) + 1
+            continue
+        d = _pollard_brent(m, deadline)
+        pending.extend((d, m // d))
+    return sorted(powers.items())
+
+
+_spf_table = array("I")  # Smallest prime factor of every index, 0 for primes, shared by all batches
+_spf_lock = threading.Lock()
+
+
+def smallest_prime_factors(limit):
+    """
+    Return the cached smallest-prime-factor table covering [0, limit], building or growing it first
+    if needed. Multiples of each base prime are marked with one slice assignment, like the bytearray
+    in SieveOfEratosthenes; primes go from largest to smallest so every entry ends up holding the
+    smallest one.
+
+    Args:
+        limit (int): Largest number the table has to cover
+
+    Returns:
+        array: Table of 32-bit entries where entry k is the smallest prime factor of k, or 0 if k is prime
+    """
+    global _spf_table
+    with _spf_lock:
+        if len(_spf_table) > limit:
+            return _spf_table
+        size = max(limit + 1, 2 * len(_spf_table))  # Grow geometrically so repeated batches rebuild rarely
+        spf = array("I", bytes(4 * size))
+        base_primes = SieveOfEratosthenes(max(2, math.isqrt(size - 1))).primes
+        for p in reversed(base_primes):
+            spf[p * p::p] = array("I", [p]) * len(range(p * p, size, p))
+        _spf_table = spf
+        return spf
+
+
+def factorize_many(values, limit=10 ** 7):
+    """
+    Factorize many integers at once with the smallest-prime-factor table, so each number takes
+    O(log n) table lookups. Numbers above `limit` fall back to factorize.
+    The result is flat (CSR style): the prime factors of values[i], in ascending order and repeated
+    by multiplicity, are factors[offsets[i]:offsets[i + 1]].
+
+    Args:
+        values (iterable): Integers to factorize (each > 1 and below 2^64), a NumPy array is accepted
+        limit (int): Largest number served from the table
+
+    Returns:
+        tuple: (offsets, factors) as unsigned 64-bit arrays, NumPy arrays if values was one
+
+    Raises:
+        ValueError: If a value is smaller than 2
+    """
+    as_numpy = np is not None and isinstance(values, np.ndarray)
+    values = values.ravel().tolist() if as_numpy else list(values)
+    if values and min(values) < 2:
+        raise ValueError("The number must be a positive integer greater than 1.")
+    table_limit = min(max(values, default=2), limit)
+    spf = smallest_prime_factors(table_limit)
+
+    offsets = array("Q", [0])
+    factors = array("Q")
+    for n in values:
+        if n <= table_limit:
+            while n > 1:
+                p = spf[n] or n
+                factors.append(p)
+                n //= p
+        else:
+            factors.extend(p for p, e in factorize(n) for _ in range(e))
+        offsets.append(len(factors))
+
+    if as_numpy:
+        return np.frombuffer(offsets, dtype=np.uint64), np.frombuffer(factors, dtype=np.uint64)
+    return offsets, factors
 
 
 class PrimeFactors:
     """
-    A class to find all prime factors of a given integer using trial division.
+    A class to find all prime factors of a given integer using trial division by small primes,
+    Miller-Rabin primality tests and Pollard-Brent rho for the remaining cofactors.
 
     Attributes:
         n (int): The number to factorize (must be > 1)
+        timeout (float): Time budget in seconds, None for no limit
         factors (list): List to store the prime factors
     """
 
-    def __init__(self, n):
+    def __init__(self, n, timeout=None):
         if n < 2:
             raise ValueError("The number must be a positive integer greater than 1.")
         self.n = n
+        self.timeout = timeout
         self.factors = []
 
-    def find_factors(self):
+    def find_factor_powers(self):
         """
-        Performs prime factorization using trial division.
+        Performs prime factorization with multiplicities.
 
         Returns:
-            list: The prime factors of the original number in ascending order
+            list: (prime, exponent) pairs in ascending order of the prime
+
+        Raises:
+            TimeoutError: If the factorization does not finish within the time budget
+        """
+        return factorize(self.n, self.timeout)
+
+    def find_factors(self):
         """
-        # Handle even factors
-        while self.n % 2 == 0:
-            self.factors.append(2)
-            self.n //= 2
+        Performs prime factorization.
 
-        # Check odd factors up to sqrt(n)
-        limit = int(self.n ** 0.5) + 1
-        for i in range(3, limit, 2):
-            while self.n % i == 0:
-                self.factors.append(i)
-                self.n //= i
+        Returns:
+            list: The prime factors of the original number in ascending order, repeated by multiplicity
 
-        # If remaining n is a prime > 2
-        if self.n > 2:
-            self.factors.append(self.n)
+        Raises:
+            TimeoutError: If the factorization does not finish within the time budget
+        """
+        self.factors = [p for p, e in self.find_factor_powers() for _ in range(e)]
         return self.factors
 
 
@@ -453,6 +1231,161 @@ class UnitConverter:
         return conversions.get(self.to_unit, "Invalid conversion.")
 
 
+LUHN_FILE_CHUNK = 1 << 26  # Bytes of a card file validated at once
+_DIGITS = b"0123456789"
+_LUHN_PLAIN = bytes.maketrans(_DIGITS, bytes(range(10)))
+_LUHN_DOUBLED = bytes.maketrans(_DIGITS, bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))  # 2d, minus 9 above 9
+
+
+# Issuer networks as (name, (first, last) prefix ranges, allowed lengths); longer prefixes win
+CARD_NETWORKS = (
+    ("Visa", (("4", "4"),), (13, 16, 19)),
+    ("Mastercard", (("51", "55"), ("2221", "2720")), (16,)),
+    ("American Express", (("34", "34"), ("37", "37")), (15,)),
+    ("Discover", (("6011", "6011"), ("644", "649"), ("65", "65"), ("622126", "622925")), (16, 17, 18, 19)),
+    ("Diners Club", (("300", "305"), ("36", "36"), ("38", "39")), (14, 15, 16, 17, 18, 19)),
+    ("JCB", (("3528", "3589"),), (16, 17, 18, 19)),
+    ("UnionPay", (("62", "62"),), (16, 17, 18, 19)),
+    ("Maestro", (("5018", "5018"), ("5020", "5020"), ("5038", "5038"), ("5893", "5893"), ("6304", "6304"),
+                 ("6759", "6759"), ("6761", "6763")), (12, 13, 14, 15, 16, 17, 18, 19)),
+    ("Mir", (("2200", "2204"),), (16,)),
+)
+
+
+class CardNetworkIndex:
+    """
+    Identifies the issuing network of card numbers by their leading digits (BIN/IIN). The network table
+    is compiled once into a digit trie, walked in O(prefix length) for single numbers, and into a
+    sorted table of disjoint BIN ranges searched with NumPy for batches. Where ranges overlap the
+    most specific one wins.
+
+    Attributes:
+        names (tuple): Network names, indexed by network id
+        lengths (tuple): Allowed number lengths of every network, as frozensets
+        trie (dict): Nested dicts keyed by digit byte, a node's network id is stored under None
+        bounds (ndarray): First BIN of every range of the table, None without NumPy
+        range_networks (ndarray): Network id of every range, -1 for unassigned BINs
+        allowed (ndarray): allowed[network id, length], with a last row (id -1) allowing every length
+    """
+    BIN_DIGITS = 6
+
+    def __init__(self, networks=CARD_NETWORKS):
+        self.names = tuple(name for name, _, _ in networks)
+        self.lengths = tuple(frozenset(lengths) for _, _, lengths in networks)
+        space = 10 ** self.BIN_DIGITS
+
+        # Cut the BIN space at every range end and give each piece to its narrowest covering range
+        ranges = []
+        for network, (_, prefixes, _) in enumerate(networks):
+            for first, last in prefixes:
+                if len(first) != len(last) or not first.isdigit() or not last.isdigit() or first > last \
+                        or len(first) > self.BIN_DIGITS:
+                    raise ValueError("Prefix ranges must be pairs of equally long digit strings.")
+                scale = 10 ** (self.BIN_DIGITS - len(first))
+                ranges.append((int(first) * scale, (int(last) + 1) * scale, network))
+        cuts = sorted({0, space}.union(*((lo, hi) for lo, hi, _ in ranges)))
+        table = []
+        for lo, hi in zip(cuts, cuts[1:]):
+            covering = [(end - start, network) for start, end, network in ranges if start <= lo and hi <= end]
+            network = min(covering)[1] if covering else -1
+            if table and table[-1][1] == network:
+                continue
+            table.append((lo, network))
+
+        self.trie = {}
+        for (lo, network), (hi, _) in zip(table, table[1:] + [(space, None)]):
+            if network < 0:
+                continue
+            for prefix in self._range_prefixes(lo, hi):
+                node = self.trie
+                for digit in prefix.encode():
+                    node = node.setdefault(digit, {})
+                node[None] = network
+
+        self.bounds = self.range_networks = self.allowed = None
+        if np is not None:
+            self.bounds = np.array([lo for lo, _ in table], dtype=np.int64)
+            self.range_networks = np.array([network for _, network in table], dtype=np.int16)
+            longest = max((max(lengths) for lengths in self.lengths), default=0)
+            self.allowed = np.ones((len(self.names) + 1, max(longest, Validator.MAX_LENGTH) + 1), dtype=bool)
+            self.allowed[:-1] = False
+            for network, lengths in enumerate(self.lengths):
+                self.allowed[network, list(lengths)] = True
+
+    def _range_prefixes(self, lo, hi):
+        """
+        Split the BIN range [lo, hi) into the fewest digit prefixes, taking the largest aligned block
+        of a power of ten each time.
+
+        Yields:
+            str: Prefix of at most BIN_DIGITS digits
+        """
+        while lo < hi:
+            size = 1
+            while lo % (size * 10) == 0 and lo + size * 10 <= hi:
+                size *= 10
+            digits = self.BIN_DIGITS - len(str(size)) + 1
+            yield str(lo // size).zfill(digits) if digits else ""
+            lo += size
+
+    def lookup(self, number):
+        """
+        Finds the network of a card number by walking the trie along its leading digits.
+
+        Args:
+            number (str or bytes): Card number
+
+        Returns:
+            int: Network id, -1 if no network matches
+        """
+        if isinstance(number, str):
+            number = number[:self.BIN_DIGITS].encode("utf-8")
+        node, network = self.trie, self.trie.get(None, -1)
+        for digit in number[:self.BIN_DIGITS]:
+            node = node.get(digit)
+            if node is None:
+                break
+            network = node.get(None, network)
+        return network
+
+    def name(self, number):
+        """
+        Returns:
+            str: Name of the network of a card number, None if no network matches
+        """
+        network = self.lookup(number)
+        return self.names[network] if network >= 0 else None
+
+    def length_allowed(self, network, length):
+        """
+        Returns:
+            bool: Whether a number of this length may belong to the network (any length for -1)
+        """
+        return network < 0 or length in self.lengths[network]
+
+    def lookup_batch(self, digits):
+        """
+        Finds the networks of many card numbers with one binary search each in the range table.
+
+        Args:
+            digits (ndarray): (rows, length) matrix of ASCII digits, length at least BIN_DIGITS
+
+        Returns:
+            ndarray: int16 network id of every row, -1 if no network matches
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("lookup_batch requires NumPy")
+        bins = np.zeros(len(digits), dtype=np.int32)
+        for column in range(self.BIN_DIGITS):
+            bins *= 10
+            bins += digits[:, column]
+        bins -= 48 * (10 ** self.BIN_DIGITS // 9)  # The ASCII offset of every digit, 48 * 111111
+        return self.range_networks[np.searchsorted(self.bounds, bins, side="right") - 1]
+
+
 class Validator:
     """
     A class to validate credit card numbers using the Luhn algorithm.
@@ -460,6 +1393,16 @@ class Validator:
     Attributes:
         credit_card_number (str): The card number to validate
     """
+    MIN_LENGTH = 13
+    MAX_LENGTH = 19
+    LUHN_BATCH = 1 << 18  # Rows validated together, bounds the temporary arrays
+
+    # Per-row error codes of the batch validation
+    OK = 0
+    EMPTY = 1
+    NON_DIGIT = 2
+    BAD_LENGTH = 3
+    NETWORK_LENGTH = 4  # The length is not used by the card's network
 
     def __init__(self, credit_card_number):
         self.credit_card_number = credit_card_number
@@ -478,7 +1421,7 @@ class Validator:
             raise ValueError("Credit card number cannot be empty.")
         if not self.credit_card_number.isdigit():
             raise ValueError("Credit card number must contain only digits.")
-        if len(self.credit_card_number) < 13 or len(self.credit_card_number) > 19:
+        if len(self.credit_card_number) < self.MIN_LENGTH or len(self.credit_card_number) > self.MAX_LENGTH:
             raise ValueError("Credit card number must be between 13 and 19 digits long.")
 
         digits = [int(digit) for digit in self.credit_card_number]
@@ -493,6 +1436,350 @@ class Validator:
         total_sum = sum(digits)
         return total_sum % 10 == 0
 
+    def identify(self, networks=None):
+        """
+        Identifies the issuing network of the card number and validates it against the Luhn checksum and
+        the lengths used by that network.
+
+        Args:
+            networks (CardNetworkIndex, optional): Network index, CARD_NETWORK_INDEX by default
+
+        Returns:
+            tuple: (network name or None if unknown, True if valid)
+
+        Raises:
+            ValueError: If the input is invalid (empty, non-numeric, or wrong length)
+        """
+        networks = networks or CARD_NETWORK_INDEX
+        valid = self.check_luhn()
+        network = networks.lookup(self.credit_card_number)
+        valid = valid and networks.length_allowed(network, len(self.credit_card_number))
+        return (networks.names[network] if network >= 0 else None), valid
+
+    @classmethod
+    def check_luhn_batch(cls, numbers, offsets=None, networks=None):
+        """
+        Validates many card numbers at once with NumPy. Instead of raising, malformed rows get an
+        error code, checked in the same order as check_luhn: EMPTY, NON_DIGIT, then BAD_LENGTH. With a
+        network index the network of every well-formed row is looked up in the same pass, and rows whose
+        length that network does not use get NETWORK_LENGTH.
+
+        Args:
+            numbers: Array of fixed-width byte strings (dtype 'S', str arrays are UTF-8 encoded), or,
+                with offsets, a bytes-like buffer holding the numbers back to back
+            offsets (array_like, optional): n + 1 non-decreasing positions, row i is
+                numbers[offsets[i]:offsets[i + 1]]
+            networks (CardNetworkIndex, optional): Index to identify networks with, e.g. CARD_NETWORK_INDEX
+
+        Returns:
+            tuple: (valid, codes) arrays, a boolean mask and the uint8 error code (OK, EMPTY,
+                NON_DIGIT, BAD_LENGTH or NETWORK_LENGTH) of every row, followed with networks by
+                the int16 network ids (-1 if unknown or malformed)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the array is not of byte strings or the offsets do not fit the buffer
+        """
+        if np is None:
+            raise ImportError("check_luhn_batch requires NumPy")
+        if offsets is None:
+            numbers = np.asarray(numbers)
+            if numbers.dtype.kind == "U":
+                numbers = np.char.encode(numbers, "utf-8")
+            if numbers.dtype.kind != "S":
+                raise ValueError("Numbers must be an array of byte strings.")
+            numbers = np.ascontiguousarray(numbers.ravel())
+            width = numbers.dtype.itemsize
+            data = numbers.view(np.uint8)
+            starts = np.arange(len(numbers), dtype=np.int64) * width
+            # Byte strings are padded with trailing NULs
+            matrix = data.reshape(len(numbers), width)
+            filled = matrix != 0
+            lengths = np.where(filled.any(axis=1), width - filled[:, ::-1].argmax(axis=1), 0)
+            return cls._luhn_rows(data, starts, starts + lengths, matrix, networks)
+
+        data = np.frombuffer(numbers, dtype=np.uint8)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] < 0 or offsets[-1] > len(data) \
+                or (np.diff(offsets) < 0).any():
+            raise ValueError("Offsets must be non-decreasing positions inside the buffer.")
+        return cls._luhn_rows(data, offsets[:-1], offsets[1:], networks=networks)
+
+    @classmethod
+    def _luhn_rows(cls, data, starts, ends, matrix=None, networks=None):
+        """
+        Validate the rows data[starts[i]:ends[i]], LUHN_BATCH rows at a time. Rows are in buffer order
+        and do not overlap; bytes between them, such as newlines, are ignored. Well-formed rows are checked
+        in groups of equal length, where the doubled digits are every second column from the right of a
+        (rows, length) digit matrix.
+
+        Args:
+            data (ndarray): uint8 buffer
+            starts (ndarray): First byte of each row
+            ends (ndarray): End of each row (exclusive)
+            matrix (ndarray, optional): data as a (rows, width) matrix when rows are fixed-width slots
+            networks (CardNetworkIndex, optional): Index to identify networks and check lengths with
+
+        Returns:
+            tuple: (valid, codes) arrays, and network ids with networks
+        """
+        rows = len(starts)
+        valid = np.zeros(rows, dtype=bool)
+        codes = np.zeros(rows, dtype=np.uint8)
+        network_ids = np.full(rows, -1, dtype=np.int16)
+        lengths = ends - starts
+        codes[(lengths < cls.MIN_LENGTH) | (lengths > cls.MAX_LENGTH)] = cls.BAD_LENGTH
+        for first in range(0, rows, cls.LUHN_BATCH):
+            last = min(first + cls.LUHN_BATCH, rows)
+            if matrix is not None:
+                # Column by column, as reductions along short rows are slow
+                block, block_lengths = matrix[first:last], lengths[first:last]
+                bad = np.zeros(last - first, dtype=bool)
+                for column in range(min(block.shape[1], int(block_lengths.max(initial=0)))):
+                    bad |= (block[:, column] - np.uint8(48) > 9) & (block_lengths > column)
+            else:
+                # One reduction per row start, with the bytes between rows (separators) cleared
+                lo, hi = int(starts[first]), int(ends[last - 1])
+                non_digit = np.zeros(hi - lo + 1, dtype=bool)  # The extra False lets empty rows start at hi
+                np.greater(data[lo:hi] - np.uint8(48), 9, out=non_digit[:-1])
+                gaps = starts[first + 1:last] - ends[first:last - 1]
+                if gaps.any():
+                    within = np.arange(gaps.sum()) - np.repeat(np.cumsum(gaps) - gaps, gaps)
+                    non_digit[np.repeat(ends[first:last - 1] - lo, gaps) + within] = False
+                bad = np.logical_or.reduceat(non_digit, starts[first:last] - lo)
+            chunk = codes[first:last]
+            chunk[bad] = cls.NON_DIGIT
+            chunk[lengths[first:last] == 0] = cls.EMPTY
+
+            chunk_lengths = np.where(chunk == cls.OK, lengths[first:last], 0)
+            for length in range(cls.MIN_LENGTH, cls.MAX_LENGTH + 1):
+                group = first + np.flatnonzero(chunk_lengths == length)
+                if not len(group):
+                    continue
+                if matrix is not None:
+                    digits = matrix[first:last, :length] if len(group) == last - first else matrix[group, :length]
+                else:
+                    digits = data[starts[group, None] + np.arange(length)]
+                valid[group] = cls._luhn_total(digits) % 10 == 0
+                if networks is not None:
+                    # The digits are already at hand, so the BIN lookup costs no extra pass
+                    network_ids[group] = found = networks.lookup_batch(digits)
+                    allowed = networks.allowed[found, length]
+                    valid[group] &= allowed
+                    codes[group[~allowed]] = cls.NETWORK_LENGTH
+        if networks is not None:
+            return valid, codes, network_ids
+        return valid, codes
+
+    @staticmethod
+    def _luhn_total(digits, payload=False):
+        """
+        Luhn sum of the rows of a (rows, length) matrix of ASCII digits, computed a column at a time with
+        the translate tables. The doubled digits are every second one from the right, starting with the
+        second to last, or with the last for a payload that is still missing its check digit.
+
+        Returns:
+            ndarray: Luhn sum of every row
+        """
+        plain = np.frombuffer(_LUHN_PLAIN, dtype=np.uint8)
+        doubled = np.frombuffer(_LUHN_DOUBLED, dtype=np.uint8)
+        length = digits.shape[1]
+        total = np.zeros(len(digits), dtype=np.uint16)
+        for column in range(length):
+            table = doubled if (length - column) % 2 == (1 if payload else 0) else plain
+            total += table[digits[:, column]]
+        return total
+
+    @classmethod
+    def _check_line(cls, line, networks=None):
+        """
+        Validate one number given as bytes with translate tables instead of per-digit Python ints.
+
+        Returns:
+            tuple: (valid, error code)
+        """
+        if not line:
+            return False, cls.EMPTY
+        if line.translate(None, _DIGITS):
+            return False, cls.NON_DIGIT
+        if len(line) < cls.MIN_LENGTH or len(line) > cls.MAX_LENGTH:
+            return False, cls.BAD_LENGTH
+        if networks is not None and not networks.length_allowed(networks.lookup(line), len(line)):
+            return False, cls.NETWORK_LENGTH
+        total = sum(line[-1::-2].translate(_LUHN_PLAIN)) + sum(line[-2::-2].translate(_LUHN_DOUBLED))
+        return total % 10 == 0, cls.OK
+
+    @classmethod
+    def validate_file(cls, path, output=None, result="bitmask", chunk_size=LUHN_FILE_CHUNK, networks=None):
+        """
+        Validates a file of newline-delimited card numbers (LF or CRLF). The file is memory-mapped and
+        scanned in chunks of whole lines; with NumPy the newlines of a chunk are found in one pass and
+        the lines validated by check_luhn_batch's vectorized core, without it each line is checked as a
+        bytes slice with translate tables. No str object is created per line.
+
+        Args:
+            path (str): File to validate
+            output (str, optional): File receiving the raw result bytes
+            result (str): 'bitmask' for one bit per line, set if the line is valid (bit i is bit i % 8,
+                least significant first, of byte i // 8), 'offsets' for the byte offsets of invalid lines
+            chunk_size (int): Approximate number of bytes scanned at once
+            networks (CardNetworkIndex, optional): Also reject lines whose length their network does not use
+
+        Returns:
+            tuple: (number of lines, number of invalid lines, result) where result is a bytearray
+                bitmask or an array('q') of offsets
+
+        Raises:
+            ValueError: If the result kind is unknown
+        """
+        if result not in ("bitmask", "offsets"):
+            raise ValueError("Result must be 'bitmask' or 'offsets'.")
+        valid_parts, invalid_offsets, invalid = [], array("q"), 0
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            try:
+                position = 0
+                while position < size:
+                    # Cut the chunk after its last newline, or at the end of a line longer than the chunk
+                    end = mm.rfind(b"\n", position, min(position + chunk_size, size)) + 1
+                    if end <= position:
+                        end = mm.find(b"\n", position + chunk_size) + 1 if position + chunk_size < size else 0
+                        end = end or size
+                    if np is not None:
+                        view, starts, ends, matrix = cls._chunk_lines(mm, position, end)
+                        valid = cls._luhn_rows(view, starts, ends, matrix, networks)[0]
+                        del view, matrix  # Release the exports so that the map can be closed
+                        valid_parts.append(valid)
+                        invalid += len(valid) - int(np.count_nonzero(valid))
+                        if result == "offsets":
+                            invalid_offsets.frombytes((starts[~valid] + position).astype("q").tobytes())
+                    else:
+                        valid = bytearray()
+                        start = position
+                        while start < end:
+                            stop = mm.find(b"\n", start, end)
+                            stop = end if stop < 0 else stop
+                            line = mm[start:stop - 1 if stop > start and mm[stop - 1] == 13 else stop]
+                            ok = cls._check_line(line, networks)[0]
+                            valid.append(ok)
+                            if not ok:
+                                invalid += 1
+                                if result == "offsets":
+                                    invalid_offsets.append(start)
+                            start = stop + 1
+                        valid_parts.append(valid)
+                    position = end
+            finally:
+                if size:
+                    mm.close()
+
+        lines = sum(len(part) for part in valid_parts)
+        if result == "bitmask":
+            if np is not None:
+                flags = np.concatenate(valid_parts) if valid_parts else np.zeros(0, dtype=bool)
+                data = bytearray(np.packbits(flags, bitorder="little").tobytes())
+            else:
+                data = bytearray((lines + 7) // 8)
+                for i, ok in enumerate(b for part in valid_parts for b in part):
+                    if ok:
+                        data[i >> 3] |= 1 << (i & 7)
+        else:
+            data = invalid_offsets
+        if output is not None:
+            with open(output, "wb") as f:
+                f.write(data)
+        return lines, invalid, data
+
+    @classmethod
+    def _chunk_lines(cls, mm, position, end):
+        """
+        Find the lines of mm[position:end] with NumPy, without copying the mapped bytes. When all lines
+        have the same width, as in most card files, the bytes are also viewed as a (lines, stride) matrix
+        so that the digits are read row by row instead of gathered byte by byte.
+
+        Returns:
+            tuple: (bytes view, line starts, line ends without the newline and a preceding CR, matrix or None)
+        """
+        view = np.frombuffer(mm, dtype=np.uint8, count=end - position, offset=position)
+        newlines = view == 10
+        count = int(np.count_nonzero(newlines))
+        stride = int(newlines.argmax()) + 1 if count else 0
+        if count and view[-1] == 10 and count * stride == len(view) and newlines[stride - 1::stride].all():
+            matrix = view.reshape(count, stride)
+            starts = np.arange(count, dtype=np.int64) * stride
+            ends = starts + (stride - 1 - (matrix[:, stride - 2] == 13) if stride > 1 else 0)
+            return view, starts, ends, matrix
+        newlines = np.flatnonzero(newlines)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.append(newlines, len(view))
+        if view[-1] == 10:  # The chunk's last newline does not start another line
+            starts, ends = starts[:-1], ends[:-1]
+        ends -= (ends > starts) & (view[np.maximum(ends - 1, 0)] == 13)
+        return view, starts, ends, None
+
+    @staticmethod
+    def luhn_complete(payload):
+        """
+        Append the Luhn check digit to a number, e.g. for issuing card numbers.
+
+        Args:
+            payload (str): Digits without the check digit
+
+        Returns:
+            str: The payload followed by its check digit
+
+        Raises:
+            ValueError: If the payload is empty or not numeric
+        """
+        if not payload or not payload.isascii() or not payload.isdigit():
+            raise ValueError("Payload must be a non-empty string of digits.")
+        line = payload.encode()
+        total = sum(line[-2::-2].translate(_LUHN_PLAIN)) + sum(line[-1::-2].translate(_LUHN_DOUBLED))
+        return payload + str(-total % 10)
+
+    @classmethod
+    def luhn_complete_batch(cls, payloads):
+        """
+        Append Luhn check digits to many numbers at once with NumPy.
+
+        Args:
+            payloads (array_like): Byte or str strings of digits
+
+        Returns:
+            ndarray: Byte strings (dtype 'S', one wider than the input) with the check digits appended
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If a payload is empty or not numeric
+        """
+        if np is None:
+            raise ImportError("luhn_complete_batch requires NumPy")
+        payloads = np.asarray(payloads)
+        if payloads.dtype.kind == "U":
+            payloads = np.char.encode(payloads, "utf-8")
+        if payloads.dtype.kind != "S":
+            raise ValueError("Payloads must be strings of digits.")
+        payloads = np.ascontiguousarray(payloads.ravel())
+        width = payloads.dtype.itemsize
+        matrix = payloads.view(np.uint8).reshape(len(payloads), width)
+        filled = matrix != 0
+        lengths = np.where(filled.any(axis=1), width - filled[:, ::-1].argmax(axis=1), 0)
+        inside = np.arange(width) < lengths[:, None]
+        if (lengths == 0).any() or ((matrix - np.uint8(48) > 9) & inside).any():
+            raise ValueError("Payloads must be non-empty strings of digits.")
+
+        completed = np.zeros((len(payloads), width + 1), dtype=np.uint8)
+        completed[:, :width] = matrix
+        for length in np.unique(lengths):
+            group = np.flatnonzero(lengths == length)
+            total = cls._luhn_total(matrix[group, :length], payload=True)
+            completed[group, length] = (-total.astype(np.int64) % 10 + 48).astype(np.uint8)
+        return completed.view(f"S{width + 1}").ravel()
+
+
+CARD_NETWORK_INDEX = CardNetworkIndex()
+
 
 class Taxes:
     """
@@ -569,11 +1856,11 @@ class Factorial:
 if __name__ == "__main__":
     try:
         # Calculate pi to nth digit
-        n = int(input("Enter the number of decimal places (up to 100): "))
+        n = int(input("Enter the number of decimal places: "))
         print(f"Pi to {n} decimal places: {Pi(n).calculate()}")
 
         # Calculate e to nth digit
-        n = int(input("Enter the number of decimal places (up to 100): "))
+        n = int(input("Enter the number of decimal places: "))
         print(f"E to {n} decimal places: {E(n).taylor_series()}")
 
         # Fibonacci Sequence to n
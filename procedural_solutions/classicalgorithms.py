@@ -1,3 +1,6 @@
+import math
+
+
 def collatz_conjecture(n):
     if n <= 1:
         raise ValueError('n must be grater than 1')
@@ -6,7 +9,7 @@ def collatz_conjecture(n):
         if n % 2:
             n = n*3 + 1
         else:
-            n /= 2
+            n //= 2
         steps += 1
     return steps
 
@@ -99,7 +102,7 @@ def sieve_of_eratosthenes(n):
         raise ValueError('n must be grater than 1')
     sieve = bytearray([1]) * (n + 1)
     sieve[0] = sieve[1] = 0
-    for i in range(2, n + 1):
+    for i in range(2, math.isqrt(n) + 1):
         if sieve[i]:
             sieve[i*i::i] = b'\x00' * len(sieve[i*i::i])
     primes = [i for i, is_prime in enumerate(sieve) if is_prime]
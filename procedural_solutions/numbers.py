@@ -1,48 +1,71 @@
 import math
 
 
-# Gauss–Legendre algorithm, limit = 100 digits
-def find_pi_to_nth_digit(n):
-    if n > 100:
-        raise ValueError("The number of decimal places is limited to 100.")
+# Decimal string of a big integer, split on powers of ten to stay below the int -> str digit limit
+def int_to_str(x):
+    if x < 10 ** 2000:
+        return str(x)
+    half = int(x.bit_length() * math.log10(2)) // 2
+    high, low = divmod(x, 10 ** half)
+    return int_to_str(high) + int_to_str(low).zfill(half)
+
+
+# Chudnovsky algorithm with binary splitting on integers, no digit limit
+def chudnovsky_split(a, b):
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a ** 3 * (640320 ** 3 // 24)
+        t = p * (13591409 + 545140134 * a)
+        if a & 1:
+            t = -t
+        return p, q, t
+    m = (a + b) // 2
+    p1, q1, t1 = chudnovsky_split(a, m)
+    p2, q2, t2 = chudnovsky_split(m, b)
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
 
-    accuracy = 10 ** (-n)
 
-    a = 1.0
-    b = 1.0 / (2 ** 0.5)
-    t = 0.25
-    p = 1.0
+def find_pi_to_nth_digit(n):
+    if n < 0:
+        raise ValueError("The number of decimal places must be a non-negative integer.")
 
-    while abs(a - b) > accuracy:
-        a_next = (a + b) / 2
-        b = (a * b) ** 0.5
-        t -= p * ((a - a_next) ** 2)
-        a = a_next
-        p *= 2
+    guard = 10
+    one = 10 ** (n + guard)
+    # every term of the series adds about 14 digits
+    p, q, t = chudnovsky_split(0, (n + guard) // 14 + 2)
+    pi = q * 426880 * math.isqrt(10005 * one * one) // t
 
-    pi = ((a + b) ** 2) / (4 * t)
-    return round(pi, n)
+    digits = int_to_str((pi + 5 * 10 ** (guard - 1)) // 10 ** guard)
+    return digits[0] + "." + digits[1:] if n else digits
 
 
-# Taylor series, limit = 100 digits
-def find_e_to_nth_digit(n):
-    if n > 100:
-        raise ValueError("The number of decimal places is limited to 100.")
+# Taylor series of e summed with binary splitting, p / q = sum of a! / k! for k in (a, b]
+def e_split(a, b):
+    if b - a == 1:
+        return 1, b
+    m = (a + b) // 2
+    p1, q1 = e_split(a, m)
+    p2, q2 = e_split(m, b)
+    return p1 * q2 + p2, q1 * q2
 
-    accuracy = 10 ** (-n)
 
-    e = 0.0
-    factorial = 1.0
-    k = 0
+def find_e_to_nth_digit(n):
+    if n < 0:
+        raise ValueError("The number of decimal places must be a non-negative integer.")
 
-    while True:
-        e += (1.0 / factorial)
-        if (1.0 / factorial) < accuracy:
-            break
-        k += 1
-        factorial *= k
+    guard = 10
+    terms = 1
+    # add terms until terms! exceeds 10 ** (n + guard)
+    while math.lgamma(terms + 1) <= (n + guard + 1) * math.log(10):
+        terms += max(1, terms // 8)
+    p, q = e_split(0, terms)
+    e = (p + q) * 10 ** (n + guard) // q
 
-    return round(e, n)
+    digits = int_to_str((e + 5 * 10 ** (guard - 1)) // 10 ** guard)
+    return digits[0] + "." + digits[1:] if n else digits
 
 
 # Fibonacci Sequence to n
@@ -60,6 +83,18 @@ def fibonacci_sequence(n):
     return fib
 
 
+# Fibonacci numbers generated lazily from index start, up to limit and/or count terms
+def iter_fibonacci(limit=None, count=None, start=0):
+    if start < 0 or (limit is not None and limit < 0) or (count is not None and count < 0):
+        raise ValueError("The number must be a non-negative integer.")
+    a, b = fib(start), fib(start + 1)
+    emitted = 0
+    while (count is None or emitted < count) and (limit is None or a <= limit):
+        yield a
+        a, b = b, a + b
+        emitted += 1
+
+
 # Fibonacci Sequence to nth number
 def fibonacci_nth_number(n):
     if n < 0:
@@ -76,24 +111,109 @@ def fibonacci_nth_number(n):
     return fib
 
 
-# Find all prime factors
+# nth Fibonacci number with fast doubling: F(2k) = F(k)(2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+def fib(n, m=None):
+    if n < 0:
+        raise ValueError("The number must be a non-negative integer.")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+        if m is not None:
+            a, b = a % m, b % m
+    return a
+
+
+# nth Fibonacci number modulo m, n reduced by the Pisano period of m first
+pisano_periods = {}
+
+
+def fib_mod(n, m):
+    if m < 1:
+        raise ValueError("The modulus must be a positive integer.")
+    if m not in pisano_periods:
+        a, b, period = 0, 1, 0
+        while True:
+            a, b = b, (a + b) % m
+            period += 1
+            if a == 0 and b == 1 or m == 1:
+                break
+        pisano_periods[m] = period
+    return fib(n % pisano_periods[m], m)
+
+
+# Miller-Rabin, deterministic for n < 3.3 * 10^24 with these bases
+def is_prime(n):
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    if n < 2:
+        return False
+    for p in bases:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# Pollard's rho with Brent's cycle detection, returns a non-trivial factor of an odd composite n
+def pollard_brent(n):
+    c = 1
+    while True:
+        x = y = 2
+        r = g = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                y = (y * y + c) % n
+                g = math.gcd(abs(x - y), n)
+                k += 1
+            r *= 2
+        if g != n:
+            return g
+        c += 1
+
+
+# Find all prime factors: trial division by small primes, then Pollard's rho on what is left
 def prime_factors(n):
     if n < 2:
         raise ValueError("The number must be a positive integer greater than 1.")
     factors = []
-    while n % 2 == 0:
-        factors.append(2)
-        n //= 2
-    limit = int(n ** 0.5) + 1
-    for i in range(3, limit, 2):
-        while n % i == 0:
-            factors.append(i)
-            n //= i
-
-    if n > 2:
-        factors.append(n)
-
-    return factors
+    p = 2
+    while p < 1000 and p * p <= n:
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+        p += 1 if p == 2 else 2
+
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime(m):
+            factors.append(m)
+        else:
+            d = pollard_brent(m)
+            pending += [d, m // d]
+
+    return sorted(factors)
 
 
 # Find Cost of Tile to Cover W x H Floor